@@ -0,0 +1,29 @@
+"""add_mealentry_user_created_index
+
+Revision ID: g7h8i9j0k1l2
+Revises: f6g7h8i9j0k1
+Create Date: 2026-10-14 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'g7h8i9j0k1l2'
+down_revision: Union[str, Sequence[str], None] = 'f6g7h8i9j0k1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add composite (user_id, created_at) index for the meal history feed."""
+    op.create_index(
+        'ix_mealentry_user_created', 'mealentry', ['user_id', 'created_at'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Remove composite meal history index."""
+    op.drop_index('ix_mealentry_user_created', table_name='mealentry')
@@ -0,0 +1,39 @@
+"""mealentry_plan_ordering_index
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-14 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h8i9j0k1l2m3'
+down_revision: Union[str, Sequence[str], None] = 'g7h8i9j0k1l2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add (meal_plan_id, day_index, meal_index) index; drop single-column indexes it and
+    ix_mealentry_user_created make redundant, plus the never-filtered name/meal_type ones."""
+    op.create_index(
+        'ix_mealentry_plan_ordering', 'mealentry',
+        ['meal_plan_id', 'day_index', 'meal_index'], unique=False,
+    )
+    op.drop_index('ix_mealentry_meal_plan_id', table_name='mealentry')
+    op.drop_index('ix_mealentry_user_id', table_name='mealentry')
+    op.drop_index('ix_mealentry_name', table_name='mealentry')
+    op.drop_index('ix_mealentry_meal_type', table_name='mealentry')
+
+
+def downgrade() -> None:
+    """Restore the single-column mealentry indexes."""
+    op.create_index('ix_mealentry_meal_type', 'mealentry', ['meal_type'], unique=False)
+    op.create_index('ix_mealentry_name', 'mealentry', ['name'], unique=False)
+    op.create_index('ix_mealentry_user_id', 'mealentry', ['user_id'], unique=False)
+    op.create_index('ix_mealentry_meal_plan_id', 'mealentry', ['meal_plan_id'], unique=False)
+    op.drop_index('ix_mealentry_plan_ordering', table_name='mealentry')
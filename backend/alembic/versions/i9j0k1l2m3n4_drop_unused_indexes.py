@@ -0,0 +1,39 @@
+"""drop_unused_indexes
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-14 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'i9j0k1l2m3n4'
+down_revision: Union[str, Sequence[str], None] = 'h8i9j0k1l2m3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop single-column indexes no query filters or sorts on."""
+    op.drop_index('ix_reciperow_title', table_name='reciperow')
+    op.drop_index('ix_reciperow_cuisine', table_name='reciperow')
+    op.drop_index('ix_stockitem_name', table_name='stockitem')
+    op.drop_index('ix_stockitem_need_to_use', table_name='stockitem')
+    op.drop_index('ix_stockitem_expiration_date', table_name='stockitem')
+    op.drop_index('ix_user_country', table_name='user')
+    op.drop_index('ix_user_onboarding_completed', table_name='user')
+
+
+def downgrade() -> None:
+    """Restore the dropped indexes."""
+    op.create_index('ix_user_onboarding_completed', 'user', ['onboarding_completed'], unique=False)
+    op.create_index('ix_user_country', 'user', ['country'], unique=False)
+    op.create_index('ix_stockitem_expiration_date', 'stockitem', ['expiration_date'], unique=False)
+    op.create_index('ix_stockitem_need_to_use', 'stockitem', ['need_to_use'], unique=False)
+    op.create_index('ix_stockitem_name', 'stockitem', ['name'], unique=False)
+    op.create_index('ix_reciperow_cuisine', 'reciperow', ['cuisine'], unique=False)
+    op.create_index('ix_reciperow_title', 'reciperow', ['title'], unique=False)
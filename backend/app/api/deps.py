@@ -1,7 +1,12 @@
+import time
+from typing import Any
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel import select
 from app.db import get_session
 from app.models.db_models import User
 from app.core.config import settings
@@ -10,30 +15,98 @@ from app.core.security import ALGORITHM
 # This tells FastAPI to look for a "Bearer <token>" in the Authorization header
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/users/login")
 
+USER_CACHE_TTL_SECONDS = 30.0
+USER_CACHE_MAX_SIZE = 1024
 
-async def get_current_user(
-        session: AsyncSession = Depends(get_session),
-        token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
+# user_id -> (expires_at, User column values minus the password hash). Per process:
+# invalidate_cached_user only clears this worker, so for up to USER_CACHE_TTL_SECONDS
+# other workers may serve an old profile or accept a token of a deleted user.
+# Handlers that write to the user row must reload it rather than use this snapshot.
+_user_cache: dict[int, tuple[float, dict[str, Any]]] = {}
+# Bumped by every invalidation. A load that started before an invalidation may
+# have read the old row, so it must not repopulate the cache.
+_cache_generation = 0
+
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_user_id(token: str) -> int:
+    """Decode the JWT and return the user id from its 'sub' claim."""
     try:
-        # 1. Decode the JWT
         payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
         user_id_str: str | None = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
+            raise credentials_exception()
+        return int(user_id_str)
     except (jwt.InvalidTokenError, ValueError):
-        raise credentials_exception
+        raise credentials_exception()
+
+
+async def get_current_user(
+        session: AsyncSession = Depends(get_session),
+        token: str = Depends(oauth2_scheme)
+) -> User:
+    # 1. Decode the JWT
+    user_id = _decode_user_id(token)
 
-    # 2. Fetch the user from DB
+    # 2. Reuse a recent snapshot; merge(load=False) attaches it without a SELECT.
+    # hashed_password is left unloaded, so no cached object holds it.
+    cached = _user_cache.get(user_id)
+    if cached is not None and cached[0] > time.monotonic():
+        snapshot = User(**cached[1])
+        make_transient_to_detached(snapshot)
+        return await session.merge(snapshot, load=False)
+
+    # 3. Fetch the user from DB
+    generation = _cache_generation
     result = await session.get(User, user_id)
     user: User | None = result
     if user is None:
-        raise credentials_exception
+        _user_cache.pop(user_id, None)
+        raise credentials_exception()
+
+    _cache_user(user, generation)
+    return user
+
+
+def _cache_user(user: User, generation: int) -> None:
+    """
+    Store the user's column values without the password hash.
+    Skipped when an invalidation happened since `generation` was read.
+    """
+    assert user.id is not None
+    if generation != _cache_generation:
+        return
+    fields = user.model_dump(exclude={"hashed_password"})
+    if user.id not in _user_cache and len(_user_cache) >= USER_CACHE_MAX_SIZE:
+        _user_cache.pop(next(iter(_user_cache)))  # oldest insert
+    _user_cache[user.id] = (time.monotonic() + USER_CACHE_TTL_SECONDS, fields)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop the cached snapshot, e.g. after the profile was updated."""
+    global _cache_generation
+    _cache_generation += 1
+    _user_cache.pop(user_id, None)
+
+
+async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """
+    Resolve the user id from the JWT alone, without loading the User row.
+    For endpoints that only scope queries by user_id. They must call
+    ensure_user_exists() when an empty result could mean a deleted user.
+    """
+    return _decode_user_id(token)
+
 
-    return user
\ No newline at end of file
+async def ensure_user_exists(session: AsyncSession, user_id: int) -> None:
+    """Cheap existence probe (SELECT 1). Raises 401 like get_current_user."""
+    result = await session.execute(select(1).where(User.id == user_id))
+    if result.first() is None:
+        raise credentials_exception()
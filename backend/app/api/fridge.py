@@ -1,13 +1,18 @@
 import base64
 import logging
 from datetime import date, timedelta
-from typing import List
+from typing import Iterable, List, Protocol
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, delete
 
-from app.api.deps import get_current_user
+from app.api.deps import (
+    credentials_exception, ensure_user_exists, get_current_user, get_current_user_id,
+)
+from app.core.http_cache import CACHE_NO_CACHE, CACHE_PRIVATE_REVALIDATE
 from app.core.rate_limit import limiter
 from app.db import get_session
 from app.models.db_models import User, StockItem
@@ -22,27 +27,36 @@ ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "application/pdf"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
 
+def _name_key(name: str) -> str:
+    """Matching key for ingredient names."""
+    return name.strip().lower()
+
+
 # //api/fridge
 @router.get("", response_model=List[StockItemDTO])
 async def get_fridge(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> List[StockItemDTO]:
-    if current_user.id is None:
-        raise HTTPException(status_code=500, detail="Invalid user state")
-    return await get_fridge_items(session, current_user.id)
+    response.headers["Cache-Control"] = CACHE_PRIVATE_REVALIDATE
+    items = await get_fridge_items(session, user_id)
+    if not items:
+        # Empty fridge and unknown user look the same — only then probe the user row
+        await ensure_user_exists(session, user_id)
+    return items
 
 
 # //api/fridge
 @router.put("", response_model=List[StockItemDTO])
 async def put_fridge(
     payload: List[StockItemDTO],
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> List[StockItemDTO]:
-    if current_user.id is None:
-        raise HTTPException(status_code=500, detail="Invalid user state")
-    return await replace_fridge_items(session, current_user.id, payload)
+    response.headers["Cache-Control"] = CACHE_NO_CACHE
+    return await _replace_for_token_user(session, user_id, payload)
 
 
 @router.post("/scan", response_model=List[ScannedItemDTO])
@@ -126,22 +140,20 @@ async def scan_receipt(
 async def merge_fridge_items(
     request: Request,
     payload: List[StockItemDTO],
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> List[StockItemDTO]:
     """Merge scanned items into the existing fridge (auto-sum matching names + expiration)."""
-    if current_user.id is None:
-        raise HTTPException(status_code=500, detail="Invalid user state")
-    existing = await get_fridge_items(session, current_user.id)
+    existing = await get_fridge_items(session, user_id)
 
     # Build a lookup by (lowercase name, expiration_date) compound key
     merged: dict[tuple[str, date | None], StockItemDTO] = {}
     for item in existing:
-        key = (item.name.strip().lower(), item.expiration_date)
+        key = (_name_key(item.name), item.expiration_date)
         merged[key] = item
 
     for item in payload:
-        key = (item.name.strip().lower(), item.expiration_date)
+        key = (_name_key(item.name), item.expiration_date)
         if key in merged:
             # Sum quantities, preserve existing need_to_use flag
             merged[key] = StockItemDTO(
@@ -153,21 +165,63 @@ async def merge_fridge_items(
         else:
             merged[key] = item
 
-    return await replace_fridge_items(session, current_user.id, list(merged.values()))
+    return await _replace_for_token_user(session, user_id, list(merged.values()))
+
+
+async def _replace_for_token_user(
+    session: AsyncSession, user_id: int, items: List[StockItemDTO],
+) -> List[StockItemDTO]:
+    """replace_fridge_items for endpoints that never loaded the User row (FK guards the write)."""
+    try:
+        result = await replace_fridge_items(session, user_id, items)
+    except IntegrityError:
+        # FK violation: the token's user no longer exists
+        await session.rollback()
+        raise credentials_exception()
+    if not result:
+        await ensure_user_exists(session, user_id)
+    return result
 
 
 async def get_fridge_items(session: AsyncSession, user_id: int) -> List[StockItemDTO]:
     """Return fridge items to the user in API schema form. Auto-ticks near-expiry items."""
-    result = await session.execute(select(StockItem).where(StockItem.user_id == user_id))
-    rows = result.scalars().all()
+    # Only the DTO columns: no ORM instances, no id/user_id on the wire
+    result = await session.execute(
+        select(  # type: ignore[type-var]
+            StockItem.name,
+            StockItem.quantity_grams,
+            StockItem.need_to_use,
+            StockItem.expiration_date,
+        ).where(StockItem.user_id == user_id)
+    )
+    return _rows_to_dtos(result.all())
+
+
+class _StockRow(Protocol):
+    """Anything carrying the DTO columns: a StockItem or a column-only result row."""
+    @property
+    def name(self) -> str: ...
+    @property
+    def quantity_grams(self) -> float: ...
+    @property
+    def need_to_use(self) -> bool: ...
+    @property
+    def expiration_date(self) -> date | None: ...
 
-    today = date.today()
-    threshold = today + timedelta(days=2)
+
+def _expiry_threshold() -> date:
+    """Items expiring on or before this date are auto-ticked as need_to_use."""
+    return date.today() + timedelta(days=2)
+
+
+def _rows_to_dtos(rows: Iterable[_StockRow]) -> List[StockItemDTO]:
+    """Map stock rows to API DTOs, auto-ticking near-expiry items (trusted, so unvalidated)."""
+    threshold = _expiry_threshold()
 
     items: List[StockItemDTO] = []
     for r in rows:
         is_expiring = r.expiration_date is not None and r.expiration_date <= threshold
-        items.append(StockItemDTO(
+        items.append(StockItemDTO.model_construct(
             name=r.name,
             quantity_grams=float(r.quantity_grams),
             need_to_use=r.need_to_use or is_expiring,
@@ -180,29 +234,58 @@ async def replace_fridge_items(
     session: AsyncSession, user_id: int, items: List[StockItemDTO], commit: bool = True,
 ) -> List[StockItemDTO]:
     """
-    Replace fridge items for a user (delete old, insert new).
+    Replace fridge items for a user with the given list.
+    Rows identical to an incoming item are kept untouched (stable ids, no write);
+    only stale rows are deleted and only new items are inserted.
     Shared by PUT /fridge and plan confirm endpoint.
     """
-    await session.execute(delete(StockItem).where(StockItem.user_id == user_id))  # type: ignore[arg-type]
+    result = await session.execute(select(StockItem).where(StockItem.user_id == user_id))
+
+    # Batches are not unique per name, so match on the full row content (multiset)
+    existing: dict[tuple[str, float, bool, date | None], List[StockItem]] = {}
+    for row in result.scalars().all():
+        key = (row.name, float(row.quantity_grams), row.need_to_use, row.expiration_date)
+        existing.setdefault(key, []).append(row)
 
+    final: List[StockItem | None] = []
+    rows: List[dict[str, object]] = []
     for it in items:
         qty = float(it.quantity_grams or 0.0)
         if qty <= 0:
             continue
 
-        session.add(
-            StockItem(
-                user_id=user_id,
-                name=it.name,
-                quantity_grams=qty,
-                need_to_use=it.need_to_use,
-                expiration_date=it.expiration_date,
-            )
+        matches = existing.get((it.name, qty, it.need_to_use, it.expiration_date))
+        if matches:
+            final.append(matches.pop())
+            continue
+
+        final.append(None)  # filled from RETURNING below
+        rows.append({
+            "user_id": user_id,
+            "name": it.name,
+            "quantity_grams": qty,
+            "need_to_use": it.need_to_use,
+            "expiration_date": it.expiration_date,
+        })
+
+    stale_ids = [row.id for batch in existing.values() for row in batch]
+    if stale_ids:
+        await session.execute(
+            delete(StockItem).where(StockItem.id.in_(stale_ids))  # type: ignore[union-attr]
         )
 
+    if rows:
+        # One multi-row INSERT; RETURNING hands back the new rows in payload order
+        inserted = await session.execute(
+            insert(StockItem).returning(StockItem, sort_by_parameter_order=True),
+            rows,
+        )
+        new_rows = iter(inserted.scalars().all())
+        final = [row if row is not None else next(new_rows) for row in final]
+
     if commit:
         await session.commit()
-    return await get_fridge_items(session, user_id)
+    return _rows_to_dtos([row for row in final if row is not None])
 
 
 async def add_ingredients_to_fridge(
@@ -212,10 +295,10 @@ async def add_ingredients_to_fridge(
     existing = await get_fridge_items(session, user_id)
     # Returned leftovers have expiration_date=None, so they merge with other None-dated items
     merged: dict[tuple[str, date | None], StockItemDTO] = {
-        (i.name.strip().lower(), i.expiration_date): i for i in existing
+        (_name_key(i.name), i.expiration_date): i for i in existing
     }
     for ing in ingredients:
-        key = (ing.name.strip().lower(), None)
+        key = (_name_key(ing.name), None)
         if key in merged:
             merged[key] = StockItemDTO(
                 name=merged[key].name,
@@ -233,32 +316,58 @@ async def add_ingredients_to_fridge(
 async def subtract_ingredients_from_fridge(
     session: AsyncSession, user_id: int, ingredients: List["IngredientAmount"],
 ) -> List[StockItemDTO]:
-    """Subtract ingredient amounts from fridge using FIFO (earliest-expiring first)."""
-    existing = await get_fridge_items(session, user_id)
+    """
+    Subtract ingredient amounts from fridge using FIFO (earliest-expiring first).
+    Only changed batches are written: partly used ones are updated in place,
+    near-expiry ones get need_to_use stored, and emptied ones are removed in a
+    single DELETE; untouched rows keep their ids.
+    """
+    result = await session.execute(select(StockItem).where(StockItem.user_id == user_id))
+    rows = result.scalars().all()
 
     # Group by lowercase name, each name can have multiple batches
-    by_name: dict[str, list[StockItemDTO]] = {}
-    for item in existing:
-        key = item.name.strip().lower()
-        by_name.setdefault(key, []).append(item)
+    by_name: dict[str, list[StockItem]] = {}
+    for row in rows:
+        by_name.setdefault(_name_key(row.name), []).append(row)
 
     # Sort each group: earliest expiration first, None last; smaller qty first for same date
     for batches in by_name.values():
         batches.sort(key=lambda x: (x.expiration_date is None, x.expiration_date or date.max, x.quantity_grams))
 
+    # A plan repeats ingredients across meals; FIFO is additive, so total them first
+    needed: dict[str, float] = {}
     for ing in ingredients:
-        key = ing.name.strip().lower()
-        batches = by_name.get(key, [])
-        if not batches:
-            continue
-        remaining = ing.quantity_grams
-        for batch in batches:
+        if ing.quantity_grams:
+            key = _name_key(ing.name)
+            needed[key] = needed.get(key, 0.0) + ing.quantity_grams
+
+    left: dict[int, float] = {}  # row id -> grams left after deduction
+    for key, remaining in needed.items():
+        for batch in by_name.get(key, []):
             if remaining <= 0:
                 break
+            assert batch.id is not None
             deducted = min(remaining, batch.quantity_grams)
-            batch.quantity_grams = batch.quantity_grams - deducted
+            left[batch.id] = batch.quantity_grams - deducted
             remaining -= deducted
 
-    # Flatten and remove zeroed items
-    updated = [item for batches in by_name.values() for item in batches if item.quantity_grams > 0]
-    return await replace_fridge_items(session, user_id, updated, commit=False)
+    emptied = [row_id for row_id, qty in left.items() if qty <= 0]
+    if emptied:
+        await session.execute(
+            delete(StockItem).where(StockItem.id.in_(emptied))  # type: ignore[union-attr]
+        )
+
+    threshold = _expiry_threshold()
+    survivors: List[StockItem] = []
+    for row in rows:
+        grams = left.get(row.id) if row.id is not None else None
+        if grams is not None and grams <= 0:
+            continue
+        if grams is not None:
+            row.quantity_grams = grams  # flushed as one batched UPDATE by primary key
+        # Persist the auto-tick the response shows, so readers of the raw flag agree
+        if not row.need_to_use and row.expiration_date is not None and row.expiration_date <= threshold:
+            row.need_to_use = True
+        survivors.append(row)
+    await session.flush()
+    return _rows_to_dtos(survivors)
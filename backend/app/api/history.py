@@ -1,12 +1,13 @@
 from typing import List
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy import desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.api.deps import get_current_user
+from app.api.deps import ensure_user_exists, get_current_user_id
+from app.core.http_cache import CACHE_PRIVATE_REVALIDATE
 from app.db import get_session
-from app.models.db_models import User, MealEntry
+from app.models.db_models import MealEntry
 from app.models.plan_models import MealHistoryItem
 
 router = APIRouter()
@@ -15,22 +16,36 @@ router = APIRouter()
 # //api/meals
 @router.get("/meals", response_model=List[MealHistoryItem])
 async def get_meal_history(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100, description="Max entries to return (1-100)"),
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> List[MealHistoryItem]:
+    response.headers["Cache-Control"] = CACHE_PRIVATE_REVALIDATE
 
+    # Only the feed columns — skips meal_json, the bulk of each row
     stmt = (
-        select(MealEntry)
-        .where(MealEntry.user_id == current_user.id)
+        select(  # type: ignore[call-overload]
+            MealEntry.id,
+            MealEntry.meal_plan_id,
+            MealEntry.day_index,
+            MealEntry.meal_index,
+            MealEntry.name,
+            MealEntry.meal_type,
+            MealEntry.created_at,
+        )
+        .where(MealEntry.user_id == user_id)
         .order_by(desc(MealEntry.created_at))  # type: ignore[arg-type]
         .limit(limit)
     )
     result = await session.execute(stmt)
-    entries = result.scalars().all()
+    entries = result.all()
+    if not entries:
+        await ensure_user_exists(session, user_id)
+    # Rows come from our own schema — skip re-validating every field
     return [
-        MealHistoryItem(
-            meal_entry_id=e.id,  # type: ignore[arg-type]
+        MealHistoryItem.model_construct(
+            meal_entry_id=e.id,
             meal_plan_id=e.meal_plan_id,
             day_index=e.day_index,
             meal_index=e.meal_index,
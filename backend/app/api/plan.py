@@ -1,9 +1,11 @@
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import List, cast, Literal
+from typing import Awaitable, List, cast, Literal
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
-from sqlalchemy import delete, func
+from sqlalchemy import delete, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from sqlmodel import select
 
 from app.api.fridge import (
@@ -21,7 +23,7 @@ from app.models.plan_models import (
 from app.services.meal_planner import generate_single_day, generate_partial_day
 from app.utils import subtract_used_from_fridge, compute_shopping_list_from_plan
 from app.db import get_session
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_id
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,14 @@ MeasurementSystem = Literal["none", "metric", "imperial"]
 Variability = Literal["traditional", "experimental"]
 
 
+def _json_response(body: str) -> Response:
+    """
+    Return an already-serialized MealPlanResponse. Plans are multi-KB; this skips
+    FastAPI's dump -> re-validate -> stdlib json.dumps round trip on the way out.
+    """
+    return Response(content=body, media_type="application/json")
+
+
 def _derive_status(
     total: int, cooked: int, finished_at: datetime | None = None,
 ) -> Literal["planned", "active", "cooked", "finished"]:
@@ -43,6 +53,25 @@ def _derive_status(
     return "active"
 
 
+async def _get_owned_entry(
+    session: AsyncSession, plan_id: int, meal_entry_id: int, user_id: int,
+) -> MealEntry:
+    """Load a user's meal entry together with its plan in a single query, or 404."""
+    result = await session.execute(
+        select(MealEntry)
+        .options(joinedload(MealEntry.meal_plan))  # type: ignore[arg-type]
+        .where(
+            MealEntry.id == meal_entry_id,
+            MealEntry.meal_plan_id == plan_id,
+            MealEntry.user_id == user_id,
+        )
+    )
+    entry = result.scalar_one_or_none()
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Meal entry not found")
+    return entry
+
+
 # GET /api/plan — List user's plans
 @router.get("", response_model=List[MealPlanSummary])
 async def list_plans(
@@ -94,7 +123,7 @@ async def get_plan_detail(
     plan_id: int,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> MealPlanResponse:
+) -> Response:
     """Get the full plan detail (parsed from response_json)."""
     plan = await session.get(MealPlan, plan_id)
     if not plan or plan.user_id != current_user.id:
@@ -109,7 +138,7 @@ async def get_plan_detail(
         )
 
     plan_obj.plan_id = plan.id
-    return plan_obj
+    return _json_response(plan_obj.model_dump_json())
 
 
 # DELETE /api/plan/{plan_id}
@@ -145,7 +174,7 @@ async def plan_meals_for_user(
     payload: MealPlanRequest = ...,  # type: ignore[assignment]
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> MealPlanResponse:
+) -> Response:
 
     payload.country = current_user.country
     payload.language = current_user.language
@@ -169,32 +198,55 @@ async def plan_meals_for_user(
     db_items = result.scalars().all()
 
     remaining_ingredients: List[StockItemDTO] = [
-        StockItemDTO(name=item.name, quantity_grams=item.quantity_grams, need_to_use=item.need_to_use)
+        StockItemDTO.model_construct(
+            name=item.name, quantity_grams=float(item.quantity_grams), need_to_use=item.need_to_use,
+        )
         for item in db_items
     ]
 
-    initial_fridge: List[StockItemDTO] = [
-        ing.model_copy() for ing in remaining_ingredients
-    ]
+    # subtract_used_from_fridge returns new items, so a shallow snapshot is enough
+    initial_fridge: List[StockItemDTO] = list(remaining_ingredients)
 
     past_meals: List[str] = list(payload.past_meals)
     meal_plan: List[SingleDayResponse] = []
 
+    day_index = 1
     try:
-        for day_index in range(1, days + 1):
-            day_req = payload.model_copy()
-            day_req.stock_items = remaining_ingredients
-            day_req.past_meals = past_meals
+        if payload.independent_days:
+            # No day depends on another, so overlap the LLM round trips. Each call learns
+            # its day number so the prompts differ and steer toward different dishes.
+            day_req = payload.model_copy(
+                update={"stock_items": remaining_ingredients, "past_meals": past_meals}
+            )
+            day_results = await asyncio.gather(
+                *(generate_single_day(day_req, day_number=d, total_days=days) for d in range(1, days + 1)),
+                return_exceptions=True,
+            )
+            # Re-raise the first failure with day_index pointing at the day that failed
+            for day_index, day_result in enumerate(day_results, start=1):
+                if isinstance(day_result, BaseException):
+                    raise day_result
+                meal_plan.append(day_result)
+            # The days could not see each other; replace any meal that repeats an earlier one
+            meal_plan = await _dedupe_meal_names(day_req, meal_plan, remaining_ingredients)
+        else:
+            for day_index in range(1, days + 1):
+                day_req = payload.model_copy(
+                    update={"stock_items": remaining_ingredients, "past_meals": past_meals}
+                )
 
-            single_day = await generate_single_day(day_req)
-            meal_plan.append(single_day)
+                single_day = await generate_single_day(day_req)
+                meal_plan.append(single_day)
 
-            remaining_ingredients = subtract_used_from_fridge(remaining_ingredients, single_day.meals)
-            past_meals.extend(m.name for m in single_day.meals)
+                remaining_ingredients = subtract_used_from_fridge(remaining_ingredients, single_day.meals)
+                past_meals.extend(m.name for m in single_day.meals)
     except HTTPException:
         raise
     except Exception as e:
-        logger.exception("Plan generation failed at day %d", day_index)
+        logger.exception(
+            "Plan generation failed at day %d (independent_days=%s)",
+            day_index, payload.independent_days,
+        )
         raise HTTPException(
             status_code=502,
             detail="Meal plan generation failed. Please try again.",
@@ -210,7 +262,8 @@ async def plan_meals_for_user(
             )
         shopping_items = []
 
-    response_obj = MealPlanResponse(
+    # Days come back from instructor already validated; shopping items are built validated
+    response_obj = MealPlanResponse.model_construct(
         plan_id=None,
         days=meal_plan,
         shopping_list=shopping_items,
@@ -241,15 +294,19 @@ async def plan_meals_for_user(
         days=days,
         meals_per_day=payload.meals_per_day,
         people_count=payload.people_count,
-        request_json=payload.model_dump_json(),
-        response_json=response_obj.model_dump_json(),
+        # stock_items is never read back — regenerate reloads the live fridge
+        request_json=payload.model_dump_json(exclude={"stock_items"}),
+        response_json="",
     )
     session.add(plan)
-    await session.commit()
-    await session.refresh(plan)
+    # Flush for the id, then serialize once: the stored copy is exactly the response body
+    await session.flush()
     response_obj.plan_id = plan.id
+    body = response_obj.model_dump_json()
+    plan.response_json = body
+    await session.commit()
 
-    return response_obj
+    return _json_response(body)
 
 
 # POST /api/plan/{plan_id}/regenerate
@@ -261,7 +318,7 @@ async def regenerate_plan(
     body: RegeneratePlanRequest,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> MealPlanResponse:
+) -> Response:
     """Regenerate unfrozen meals in an existing plan, keeping frozen meals intact."""
 
     # 1) Load plan & ownership check
@@ -298,7 +355,7 @@ async def regenerate_plan(
     # 4) If all meals are frozen, return existing plan unchanged
     total_meals = sum(len(d.meals) for d in original_resp.days)
     if len(frozen_set) >= total_meals:
-        return original_resp
+        return _json_response(plan.response_json)
 
     # 5) Re-load current fridge from DB
     result = await session.execute(
@@ -307,72 +364,46 @@ async def regenerate_plan(
     db_items = result.scalars().all()
 
     remaining_ingredients: List[StockItemDTO] = [
-        StockItemDTO(name=item.name, quantity_grams=item.quantity_grams, need_to_use=item.need_to_use)
+        StockItemDTO.model_construct(
+            name=item.name, quantity_grams=float(item.quantity_grams), need_to_use=item.need_to_use,
+        )
         for item in db_items
     ]
-    initial_fridge: List[StockItemDTO] = [ing.model_copy() for ing in remaining_ingredients]
+    initial_fridge: List[StockItemDTO] = list(remaining_ingredients)
 
     past_meals: List[str] = list(original_req.past_meals)
     new_days: List[SingleDayResponse] = []
 
-    # 6) Loop day-by-day
-    for day_index, day in enumerate(original_resp.days):
-        frozen_meals_this_day = []
-        unfrozen_indices = []
-
-        for meal_index, meal in enumerate(day.meals):
-            if (day_index, meal_index) in frozen_set:
-                frozen_meals_this_day.append((meal_index, meal))
-            else:
-                unfrozen_indices.append(meal_index)
-
-        if not unfrozen_indices:
-            # All meals frozen — keep day as-is
-            new_days.append(day)
-            remaining_ingredients = subtract_used_from_fridge(remaining_ingredients, day.meals)
-            past_meals.extend(m.name for m in day.meals)
-            continue
-
-        # Subtract frozen meals from fridge first
-        frozen_only = [m for _, m in frozen_meals_this_day]
-        remaining_ingredients = subtract_used_from_fridge(remaining_ingredients, frozen_only)
-        past_meals.extend(m.name for m in frozen_only)
-
-        # Determine which meal_type slots to regenerate
-        slots_to_generate: list[str] = [day.meals[i].meal_type for i in unfrozen_indices]
-
-        # Build request for partial generation
-        day_req = original_req.model_copy()
-        day_req.stock_items = remaining_ingredients
-        day_req.past_meals = past_meals
+    # 6) Regenerate day-by-day
+    if original_req.independent_days:
+        # The plan was built with every day from the same starting fridge, so keep that
+        # and overlap the partial-day LLM round trips
+        day_results = await asyncio.gather(
+            *(
+                _regenerate_day(original_req, day_index, day, frozen_set, initial_fridge, past_meals)
+                for day_index, day in enumerate(original_resp.days)
+            ),
+            return_exceptions=True,
+        )
+        # Each failing day already logged itself; surface the first one
+        for day_result in day_results:
+            if isinstance(day_result, BaseException):
+                raise day_result
+            new_days.append(day_result)
+        # Regenerated days could not see each other; frozen meals are never replaced,
+        # but anything regenerated that repeats them or another day is redone
+        new_days = await _dedupe_meal_names(
+            original_req, new_days, initial_fridge, locked=frozenset(frozen_set),
+        )
+    else:
+        for day_index, day in enumerate(original_resp.days):
+            new_day = await _regenerate_day(
+                original_req, day_index, day, frozen_set, remaining_ingredients, past_meals,
+            )
+            new_days.append(new_day)
 
-        try:
-            new_meals_response = await generate_partial_day(day_req, frozen_only, slots_to_generate)
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.exception("Regeneration failed at day %d", day_index)
-            raise HTTPException(
-                status_code=502,
-                detail="Meal plan regeneration failed. Please try again.",
-            ) from e
-
-        # Merge: frozen meals at their original positions, new meals fill unfrozen slots
-        merged_meals = list(day.meals)  # copy original order
-        new_meal_iter = iter(new_meals_response.meals)
-        for idx in unfrozen_indices:
-            try:
-                merged_meals[idx] = next(new_meal_iter)
-            except StopIteration:
-                break
-
-        merged_day = SingleDayResponse(meals=merged_meals)
-        new_days.append(merged_day)
-
-        # Update fridge and past_meals with newly generated meals
-        new_only = [merged_meals[i] for i in unfrozen_indices]
-        remaining_ingredients = subtract_used_from_fridge(remaining_ingredients, new_only)
-        past_meals.extend(m.name for m in new_only)
+            remaining_ingredients = subtract_used_from_fridge(remaining_ingredients, new_day.meals)
+            past_meals.extend(m.name for m in new_day.meals)
 
     # 7) Recompute shopping list
     shopping_items: List[IngredientAmount] = compute_shopping_list_from_plan(new_days, initial_fridge)
@@ -385,7 +416,7 @@ async def regenerate_plan(
             )
         shopping_items = []
 
-    response_obj = MealPlanResponse(
+    response_obj = MealPlanResponse.model_construct(
         plan_id=plan.id,
         days=new_days,
         shopping_list=shopping_items,
@@ -396,7 +427,7 @@ async def regenerate_plan(
     session.add(plan)
     await session.commit()
 
-    return response_obj
+    return _json_response(plan.response_json)
 
 
 # POST /api/plan/{plan_id}/confirm
@@ -405,18 +436,18 @@ async def regenerate_plan(
 async def confirm_plan(
     request: Request,
     plan_id: int,
-    current_user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> List[StockItemDTO]:
 
-    # Load plan & ownership check
+    # Load plan & ownership check (the plan's FK also proves the user exists)
     plan = await session.get(MealPlan, plan_id)
-    if not plan or plan.user_id != current_user.id:
+    if not plan or plan.user_id != user_id:
         raise HTTPException(status_code=404, detail="Plan not found")
 
     # Idempotence guard (do not subtract twice)
     if hasattr(plan, "confirmed_at") and getattr(plan, "confirmed_at"):
-        return await get_fridge_items(session, current_user.id)
+        return await get_fridge_items(session, user_id)
 
     # Parse stored plan response
     try:
@@ -429,12 +460,12 @@ async def confirm_plan(
 
     # Extract all ingredients and subtract from fridge
     all_ingredients = _extract_all_ingredients(plan_obj)
-    await subtract_ingredients_from_fridge(session, current_user.id, all_ingredients)
+    await subtract_ingredients_from_fridge(session, user_id, all_ingredients)
 
     # Create meal entries — all start UNCOOKED (ingredients already reserved via fridge subtraction)
     now = datetime.now(timezone.utc)
-    _persist_meal_entries(
-        session, user_id=current_user.id, plan_id=plan_id,
+    await _persist_meal_entries(
+        session, user_id=user_id, plan_id=plan_id,
         plan_obj=plan_obj, cooked_at=None,
     )
 
@@ -442,7 +473,7 @@ async def confirm_plan(
     session.add(plan)
     await session.commit()
 
-    return await get_fridge_items(session, current_user.id)
+    return await get_fridge_items(session, user_id)
 
 
 # POST /api/plan/{plan_id}/meals/{meal_entry_id}/cook
@@ -456,17 +487,12 @@ async def cook_meal(
     session: AsyncSession = Depends(get_session),
 ) -> MealEntrySummary:
     """Mark a single meal as cooked (cosmetic only — no fridge changes). Idempotent."""
-    entry = await session.get(MealEntry, meal_entry_id)
-    if (
-        not entry
-        or entry.meal_plan_id != plan_id
-        or entry.user_id != current_user.id
-    ):
-        raise HTTPException(status_code=404, detail="Meal entry not found")
+    entry = await _get_owned_entry(
+        session, plan_id, meal_entry_id, cast(int, current_user.id),
+    )
 
     # Guard: cannot cook meals on a finished plan
-    plan = await session.get(MealPlan, plan_id)
-    if plan and plan.finished_at is not None:
+    if entry.meal_plan.finished_at is not None:
         raise HTTPException(status_code=409, detail="Plan is finished.")
 
     # Idempotent: if already cooked, return as-is
@@ -499,16 +525,11 @@ async def rate_meal(
     session: AsyncSession = Depends(get_session),
 ) -> MealEntrySummary:
     """Rate a meal 1-5 stars. Auto-marks as cooked if not already."""
-    entry = await session.get(MealEntry, meal_entry_id)
-    if (
-        not entry
-        or entry.meal_plan_id != plan_id
-        or entry.user_id != current_user.id
-    ):
-        raise HTTPException(status_code=404, detail="Meal entry not found")
+    entry = await _get_owned_entry(
+        session, plan_id, meal_entry_id, cast(int, current_user.id),
+    )
 
-    plan = await session.get(MealPlan, plan_id)
-    if plan and plan.finished_at is not None:
+    if entry.meal_plan.finished_at is not None:
         raise HTTPException(status_code=409, detail="Plan is finished.")
 
     entry.rating = body.rating
@@ -542,17 +563,12 @@ async def uncook_meal(
     session: AsyncSession = Depends(get_session),
 ) -> MealEntrySummary:
     """Unmark a meal as cooked (cosmetic only — no fridge changes). Idempotent."""
-    entry = await session.get(MealEntry, meal_entry_id)
-    if (
-        not entry
-        or entry.meal_plan_id != plan_id
-        or entry.user_id != current_user.id
-    ):
-        raise HTTPException(status_code=404, detail="Meal entry not found")
+    entry = await _get_owned_entry(
+        session, plan_id, meal_entry_id, cast(int, current_user.id),
+    )
 
     # Guard: cannot uncook meals on a finished plan
-    plan = await session.get(MealPlan, plan_id)
-    if plan and plan.finished_at is not None:
+    if entry.meal_plan.finished_at is not None:
         raise HTTPException(status_code=409, detail="Plan is finished.")
 
     # Idempotent: if already uncooked, return as-is
@@ -669,13 +685,123 @@ async def finish_plan(
     )
 
 
+async def _regenerate_day(
+    req: MealPlanRequest,
+    day_index: int,
+    day: SingleDayResponse,
+    frozen_set: set[tuple[int, int]],
+    fridge: List[StockItemDTO],
+    past_meals: List[str],
+) -> SingleDayResponse:
+    """Regenerate the unfrozen meals of one day against the given fridge and meal history."""
+    frozen_only = [m for i, m in enumerate(day.meals) if (day_index, i) in frozen_set]
+    unfrozen_indices = [i for i in range(len(day.meals)) if (day_index, i) not in frozen_set]
+    if not unfrozen_indices:
+        # All meals frozen — keep day as-is
+        return day
+
+    # Frozen meals use up fridge stock first; the LLM only sees what is left
+    day_req = req.model_copy(update={
+        "stock_items": subtract_used_from_fridge(fridge, frozen_only),
+        "past_meals": [*past_meals, *(m.name for m in frozen_only)],
+    })
+    slots_to_generate: list[str] = [day.meals[i].meal_type for i in unfrozen_indices]
+
+    try:
+        new_meals_response = await generate_partial_day(day_req, frozen_only, slots_to_generate)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(
+            "Regeneration failed at day_index %d (independent_days=%s)",
+            day_index, req.independent_days,
+        )
+        raise HTTPException(
+            status_code=502,
+            detail="Meal plan regeneration failed. Please try again.",
+        ) from e
+
+    # Merge: frozen meals at their original positions, new meals fill unfrozen slots
+    merged_meals = list(day.meals)  # copy original order
+    new_meal_iter = iter(new_meals_response.meals)
+    for idx in unfrozen_indices:
+        try:
+            merged_meals[idx] = next(new_meal_iter)
+        except StopIteration:
+            break
+
+    # Both stored and freshly generated meals are already validated PlannedMeals
+    return SingleDayResponse.model_construct(meals=merged_meals)
+
+
+async def _dedupe_meal_names(
+    req: MealPlanRequest,
+    days: List[SingleDayResponse],
+    fridge: List[StockItemDTO],
+    locked: frozenset[tuple[int, int]] = frozenset(),
+) -> List[SingleDayResponse]:
+    """
+    Regenerate every meal whose name repeats an earlier meal of the plan or a locked
+    (day_index, meal_index) meal. Locked meals are never replaced. All repeats are
+    found first and the affected days retried concurrently, each seeing every kept
+    name as a past meal. Best effort: one retry per day; if a retry fails, or its
+    result still repeats, the duplicate is kept and logged.
+    """
+    # Lowercased name -> name as written, for everything kept so far
+    seen: dict[str, str] = {
+        days[d].meals[i].name.strip().lower(): days[d].meals[i].name for d, i in locked
+    }
+    repeats_by_day: dict[int, list[int]] = {}
+    for day_index, day in enumerate(days):
+        for meal_index, meal in enumerate(day.meals):
+            if (day_index, meal_index) in locked:
+                continue
+            key = meal.name.strip().lower()
+            if key in seen:
+                repeats_by_day.setdefault(day_index, []).append(meal_index)
+            else:
+                seen[key] = meal.name
+
+    if not repeats_by_day:
+        return days
+
+    def _retry(day_index: int, repeats: list[int]) -> Awaitable[SingleDayResponse]:
+        day = days[day_index]
+        keep = {(day_index, i) for i in range(len(day.meals)) if i not in repeats}
+        # The day's own kept meals reach the LLM as frozen meals, not as past meals
+        own = {day.meals[i].name.strip().lower() for _, i in keep}
+        past_meals = [*req.past_meals, *(n for k, n in seen.items() if k not in own)]
+        return _regenerate_day(req, day_index, day, keep, fridge, past_meals)
+
+    retried = await asyncio.gather(
+        *(_retry(d, repeats) for d, repeats in repeats_by_day.items()),
+        return_exceptions=True,
+    )
+
+    deduped = list(days)
+    # Retries ran concurrently and could not see each other, so check them once more
+    for (day_index, repeats), retry in zip(repeats_by_day.items(), retried):
+        if isinstance(retry, Exception):
+            logger.warning(
+                "Dedupe retry failed at day_index %d; keeping repeated meals",
+                day_index, exc_info=retry,
+            )
+            continue
+        if isinstance(retry, BaseException):
+            raise retry
+        deduped[day_index] = retry
+        for meal_index in repeats:
+            name = retry.meals[meal_index].name
+            if name.strip().lower() in seen:
+                logger.warning("Day %d still repeats meal %r after regeneration", day_index, name)
+            seen.setdefault(name.strip().lower(), name)
+
+    return deduped
+
+
 def _extract_all_ingredients(plan: MealPlanResponse) -> List[IngredientAmount]:
     """Collect all ingredients from every meal in the plan."""
-    result: List[IngredientAmount] = []
-    for day in plan.days:
-        for meal in day.meals:
-            result.extend(meal.ingredients)
-    return result
+    return [ing for day in plan.days for meal in day.meals for ing in meal.ingredients]
 
 
 def _parse_meal_ingredients(entry: MealEntry) -> List[IngredientAmount]:
@@ -684,30 +810,29 @@ def _parse_meal_ingredients(entry: MealEntry) -> List[IngredientAmount]:
     return meal.ingredients
 
 
-def _persist_meal_entries(
+async def _persist_meal_entries(
     session: AsyncSession,
     user_id: int,
     plan_id: int,
     plan_obj: MealPlanResponse,
     cooked_at: datetime | None = None,
 ) -> None:
-    """Stage meal entries into the session. Caller must await session.commit()."""
-    entries: List[MealEntry] = []
-
-    for day_index, day in enumerate(plan_obj.days, start=1):
-        for meal_index, meal in enumerate(day.meals, start=1):
-            entries.append(
-                MealEntry(
-                    user_id=user_id,
-                    meal_plan_id=plan_id,
-                    day_index=day_index,
-                    meal_index=meal_index,
-                    name=meal.name,
-                    meal_type=meal.meal_type,
-                    meal_json=meal.model_dump_json(),
-                    cooked_at=cooked_at,
-                )
-            )
+    """Insert meal entries in one executemany INSERT. Caller must await session.commit()."""
+    rows: List[dict[str, object]] = [
+        {
+            "user_id": user_id,
+            "meal_plan_id": plan_id,
+            "day_index": day_index,
+            "meal_index": meal_index,
+            "name": meal.name,
+            "meal_type": meal.meal_type,
+            "meal_json": meal.model_dump_json(),
+            "cooked_at": cooked_at,
+        }
+        for day_index, day in enumerate(plan_obj.days, start=1)
+        for meal_index, meal in enumerate(day.meals, start=1)
+    ]
 
-    if entries:
-        session.add_all(entries)
+    # Entries are never re-read in this request, so skip ORM instance tracking
+    if rows:
+        await session.execute(insert(MealEntry), rows)
@@ -1,4 +1,6 @@
-from fastapi import Depends, HTTPException, APIRouter, Request, status
+import asyncio
+
+from fastapi import Depends, HTTPException, APIRouter, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -7,7 +9,10 @@ from app.db import get_session
 from app.models.db_models import User
 from app.models.user_schemas import UserCreate, UserRead, UserUpdate, Token
 from app.core.security import verify_password, get_password_hash, create_access_token
-from app.api.deps import get_current_user
+from app.api.deps import (
+    credentials_exception, get_current_user, get_current_user_id, invalidate_cached_user,
+)
+from app.core.http_cache import CACHE_NO_CACHE, CACHE_PRIVATE_REVALIDATE
 from app.core.rate_limit import limiter
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -45,8 +50,8 @@ async def register_user(
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    # 2. Hash the password and save the user
-    hashed_pw = get_password_hash(user.password)
+    # 2. Hash the password and save the user (bcrypt is deliberately slow — keep it off the loop)
+    hashed_pw = await asyncio.to_thread(get_password_hash, user.password)
     db_user = User(email=user.email, hashed_password=hashed_pw)
     session.add(db_user)
     await session.commit()
@@ -72,8 +77,10 @@ async def login(
     result = await session.execute(statement)
     user = result.scalars().first()
 
-    # 2. Verify existence and password
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # 2. Verify existence and password (bcrypt runs in a worker thread)
+    if not user or not await asyncio.to_thread(
+        verify_password, form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -97,20 +104,29 @@ async def login(
 
 @router.get(path="", response_model=UserRead)
 async def get_user(
+    response: Response,
     current_user: User = Depends(get_current_user)
 ) -> UserRead:
     """
         Returns the profile of the user identified by the JWT.
     """
+    response.headers["Cache-Control"] = CACHE_PRIVATE_REVALIDATE
     return _to_read(current_user)
 
 
 @router.patch(path="", response_model=UserRead)
 async def update_user(
     patch: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> UserRead:
+    response.headers["Cache-Control"] = CACHE_NO_CACHE
+
+    # Write through the live row, not get_current_user's possibly stale snapshot
+    current_user = await session.get(User, user_id)
+    if current_user is None:
+        raise credentials_exception()
 
     if patch.country is not None:
         current_user.country = patch.country.strip() or None
@@ -145,4 +161,5 @@ async def update_user(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
+    invalidate_cached_user(user_id)
     return _to_read(current_user)
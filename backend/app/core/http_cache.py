@@ -0,0 +1,62 @@
+import hashlib
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
+
+# Read-mostly GETs that clients poll on every foreground/refocus.
+ETAG_PATHS = frozenset({"/api/fridge", "/api/meals", "/api/users"})
+
+# Browser may keep the copy but must revalidate (cheap 304 via the ETag) before
+# reuse — max-age would serve a stale fridge right after a PUT/merge/confirm.
+CACHE_PRIVATE_REVALIDATE = "private, no-cache"
+# Write responses: never reuse without going back to the server.
+CACHE_NO_CACHE = "no-cache"
+
+
+def _etag_for(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison per RFC 9110 §13.1.2, which is what If-None-Match uses."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+async def etag_middleware(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """
+    Attach a strong ETag to successful GETs on ETAG_PATHS and answer a matching
+    If-None-Match with an empty 304, so unchanged polls skip the body transfer.
+    """
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or request.url.path not in ETAG_PATHS
+        or response.status_code != 200
+    ):
+        return response
+
+    body_iterator = response.body_iterator  # type: ignore[attr-defined]
+    body = b"".join([chunk async for chunk in body_iterator])
+    etag = _etag_for(body)
+    # Copy the raw list: a plain dict would collapse repeated headers like Set-Cookie
+    headers = MutableHeaders(raw=list(response.raw_headers))
+    headers["ETag"] = etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        del headers["content-length"]
+        del headers["content-type"]
+        return Response(status_code=304, headers=headers, background=response.background)
+
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers=headers,
+        background=response.background,
+    )
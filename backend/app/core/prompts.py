@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from jinja2 import FileSystemLoader, Template
+from jinja2.sandbox import SandboxedEnvironment
+
+PROMPTS_DIR = Path(__file__).resolve().parents[2] / "prompts"
+
+# Shared by every LLM-facing service. Prompts only change with a deploy/restart,
+# so skip the per-render mtime check.
+prompts_env = SandboxedEnvironment(
+    loader=FileSystemLoader(str(PROMPTS_DIR)),
+    autoescape=False,
+    auto_reload=False,
+)
+
+
+def load_prompt(name: str) -> Template:
+    """Compile a prompt template; call at import so a missing file fails at startup."""
+    return prompts_env.get_template(name)
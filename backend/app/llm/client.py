@@ -29,18 +29,22 @@ class LLMClient:
         self.gemini_client: instructor.AsyncInstructor | None = None
         self.deepseek_client: instructor.AsyncInstructor | None = None
 
+        # SDK clients are created once per process so their httpx pools keep
+        # TCP/TLS connections alive across requests; closed on app shutdown.
+        self._sdk_clients: list[AsyncOpenAI] = []
+
         if settings.openai_api_key:
-            self.openai_client = instructor.from_openai(
-                AsyncOpenAI(api_key=settings.openai_api_key, timeout=60.0)
-            )
+            openai_sdk = AsyncOpenAI(api_key=settings.openai_api_key, timeout=60.0)
+            self._sdk_clients.append(openai_sdk)
+            self.openai_client = instructor.from_openai(openai_sdk)
         if settings.deepseek_api_key:
-            self.deepseek_client = instructor.from_openai(
-                AsyncOpenAI(
-                    api_key=settings.deepseek_api_key,
-                    base_url="https://api.deepseek.com",
-                    timeout=60.0,
-                )
+            deepseek_sdk = AsyncOpenAI(
+                api_key=settings.deepseek_api_key,
+                base_url="https://api.deepseek.com",
+                timeout=60.0,
             )
+            self._sdk_clients.append(deepseek_sdk)
+            self.deepseek_client = instructor.from_openai(deepseek_sdk)
         if settings.gemini_api_key:
             # Instructor seamlessly wraps the new google-genai client
             self.gemini_client = instructor.from_genai(
@@ -52,6 +56,11 @@ class LLMClient:
                 mode=instructor.Mode.GENAI_STRUCTURED_OUTPUTS,
             )
 
+    async def aclose(self) -> None:
+        """Release pooled HTTP connections held by the OpenAI-compatible SDK clients."""
+        for sdk_client in self._sdk_clients:
+            await sdk_client.close()
+
     def _get_client(self, provider: LLMProvider) -> instructor.AsyncInstructor:
         if provider == LLMProvider.GEMINI:
             if not self.gemini_client:
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import sys
 import time
@@ -11,7 +12,10 @@ from app.api.fridge import router as fridge_router
 from app.api.history import router as history_router
 from app.api.user import router as user_router
 from app.core.config import settings
+from app.core.http_cache import etag_middleware
 from app.core.rate_limit import limiter
+from app.llm.client import llm_client
+from app.services.recipe_retriever import warm_up_embedding_model
 
 # Configure the root logger
 logging.basicConfig(
@@ -27,12 +31,16 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(fastAPI: FastAPI):
+    if settings.use_rag:
+        await asyncio.to_thread(warm_up_embedding_model)
     yield
     # shutdown
+    await llm_client.aclose()
 
 app = FastAPI(title="Meal Planner LLM API", lifespan=lifespan)
 app.state.limiter = limiter
 app.add_middleware(SlowAPIMiddleware)
+app.middleware("http")(etag_middleware)
 
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
@@ -14,7 +14,7 @@ class User(SQLModel, table=True):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     # Used for ingredient availability + local recipes
-    country: str | None = Field(default=None, index=True)
+    country: str | None = Field(default=None)
 
     # "none" | "metric" | "imperial"
     measurement_system: str = Field(default="metric")
@@ -32,7 +32,7 @@ class User(SQLModel, table=True):
     track_snacks: bool = Field(default=True)
 
     # if false, frontend shows onboarding popup
-    onboarding_completed: bool = Field(default=False, index=True)
+    onboarding_completed: bool = Field(default=False)
 
     fridge_items: List["StockItem"] = Relationship(back_populates="user")
     meal_plans: List["MealPlan"] = Relationship(back_populates="user")
@@ -41,11 +41,12 @@ class User(SQLModel, table=True):
 
 class StockItem(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    # Every fridge query is WHERE user_id = ?; the remaining filtering happens in Python
     user_id: int = Field(foreign_key="user.id", index=True)
-    name: str = Field(index=True)
+    name: str
     quantity_grams: float = Field(ge=0)
-    need_to_use: bool = Field(default=False, index=True)
-    expiration_date: date | None = Field(default=None, index=True)
+    need_to_use: bool = Field(default=False)
+    expiration_date: date | None = Field(default=None)
 
     user: "User" = Relationship(back_populates="fridge_items")
 
@@ -70,12 +71,13 @@ class MealPlan(SQLModel, table=True):
 
 class MealEntry(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id", index=True)
-    meal_plan_id: int = Field(foreign_key="mealplan.id", index=True)
+    # Both FKs are covered by the leading column of a composite index below
+    user_id: int = Field(foreign_key="user.id")
+    meal_plan_id: int = Field(foreign_key="mealplan.id")
     day_index: int = Field(description="Which day of the plan this meal belongs to (1-based).")
     meal_index: int = Field(description="Index of the meal within the day (1-based).")
-    name: str = Field(index=True)
-    meal_type: str = Field(index=True)  # "breakfast", "lunch", ...
+    name: str
+    meal_type: str  # "breakfast", "lunch", ...
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -88,14 +90,20 @@ class MealEntry(SQLModel, table=True):
 
     user: "User" = Relationship(back_populates="meal_entries")
     meal_plan: "MealPlan" = Relationship(back_populates="meal_entries")
+    __table_args__ = (
+        # History feed: WHERE user_id = ? ORDER BY created_at DESC LIMIT ?
+        Index("ix_mealentry_user_created", "user_id", "created_at"),
+        # Plan views: WHERE meal_plan_id = ? ORDER BY day_index, meal_index
+        Index("ix_mealentry_plan_ordering", "meal_plan_id", "day_index", "meal_index"),
+    )
 
 
 class RecipeRow(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    title: str = Field(index=True)
+    title: str
     ingredients_text: str  # "chicken breast; rice; spinach"
     steps_text: str
-    cuisine: Optional[str] = Field(default=None, index=True)
+    cuisine: Optional[str] = Field(default=None)
     tags_text: str = Field(default="")  # "asian; spicy"
 
     # For RAG - 384 dimensions matches the all-MiniLM-L6-v2 model used in ingestion scripts
@@ -1,8 +1,12 @@
 import re
+from itertools import islice
 from typing import List, Optional, Literal
 from pydantic import BaseModel, Field, field_validator
 from datetime import date, datetime, timezone
 
+# Whitelist for free-text tags: alphanumeric, whitespace and hyphens only
+_TAG_STRIP_RE = re.compile(r"[^a-zA-Z0-9\s-]")
+
 
 class StockItemDTO(BaseModel):
     name: str
@@ -77,26 +81,26 @@ class MealPlanRequest(BaseModel):
         description="When true, only fridge/pantry ingredients may be used — no shopping.",
     )
 
+    independent_days: bool = Field(
+        default=False,
+        description=(
+            "When true, every day is planned from the same starting fridge so the per-day "
+            "LLM calls run concurrently. Faster, but days do not see each other's meals."
+        ),
+    )
+
     @field_validator("taste_preferences", "avoid_ingredients", "past_meals", mode="before")
     @classmethod
-    def sanitize_input(cls, v):
+    def sanitize_input(cls, v: List[str] | None) -> List[str]:
         # Handle cases where the input might be None
         if not v:
             return []
 
-        cleaned_list = []
-        for item in v:
-            # Enforce length limit per tag (drop it if it's too long instead of crashing the whole request)
-            if len(item) > 50:
-                continue
-
-                # Whitelist: Allow only alphanumeric, spaces, and hyphens.
-            cleaned = re.sub(r'[^a-zA-Z0-9\s-]', '', item).strip()
-            if cleaned:
-                cleaned_list.append(cleaned)
-
-        # Optional: Limit the total number of items to prevent prompt stuffing
-        return cleaned_list[:20]
+        # Drop over-long tags (instead of failing the whole request), whitelist
+        # alphanumerics/spaces/hyphens, skip empties; stop once 20 are kept to
+        # prevent prompt stuffing.
+        cleaned = (_TAG_STRIP_RE.sub('', item).strip() for item in v if len(item) <= 50)
+        return list(islice((c for c in cleaned if c), 20))
 
 
 class IngredientAmount(BaseModel):
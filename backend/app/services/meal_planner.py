@@ -1,12 +1,9 @@
 from __future__ import annotations
 
 import logging
-from pathlib import Path
 from typing import TYPE_CHECKING
 
-from jinja2.sandbox import SandboxedEnvironment
-from jinja2 import FileSystemLoader
-
+from app.core.prompts import load_prompt
 from app.llm.client import llm_client
 from app.models.plan_models import MealPlanRequest, PlannedMeal, SingleDayResponse
 from app.services.recipe_retriever import retrieve_recipes
@@ -15,19 +12,34 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 logger = logging.getLogger(__name__)
 
-_prompts_env = SandboxedEnvironment(
-    loader=FileSystemLoader(str(Path(__file__).resolve().parents[2] / "prompts")),
-    autoescape=False,
-)
+_TPL_PLAN = load_prompt("meal_plan.jinja")
+_TPL_PLAN_PARTIAL = load_prompt("meal_plan_partial.jinja")
+_TPL_PLAN_RAG = load_prompt("meal_plan_rag.jinja")
 
 SYSTEM_PROMPT = "You are a careful and realistic meal planner. ALWAYS return ONLY valid JSON."
 
-async def generate_single_day(req: MealPlanRequest) -> SingleDayResponse:
+def _dump_for_prompt(req: MealPlanRequest) -> dict[str, object]:
+    """
+    Template context by plain attribute access over every request field (so a template
+    can never reference a field that is silently missing). The request is already
+    validated, and Jinja reads StockItemDTO attributes directly, so skip the recursive
+    model_dump().
+    """
+    return {field: getattr(req, field) for field in MealPlanRequest.model_fields}
+
+async def generate_single_day(
+    req: MealPlanRequest,
+    day_number: int | None = None,
+    total_days: int | None = None,
+) -> SingleDayResponse:
     """
     Generates a meal plan for a single day with strict schema enforcement.
+    day_number/total_days tell a day planned concurrently with its siblings which one it
+    is, so each call is nudged toward different dishes.
     """
-    template = _prompts_env.get_template("meal_plan.jinja")
-    user_prompt = template.render(**req.model_dump())
+    user_prompt = _TPL_PLAN.render(
+        **_dump_for_prompt(req), day_number=day_number, total_days=total_days,
+    )
 
     # AI-01: Pass the Pydantic schema as response_model
     response = await llm_client.chat_json(
@@ -48,9 +60,8 @@ async def generate_partial_day(
     Generates only the unfrozen meal slots for a single day,
     using frozen meals as context so the LLM complements them.
     """
-    template = _prompts_env.get_template("meal_plan_partial.jinja")
-    user_prompt = template.render(
-        **req.model_dump(),
+    user_prompt = _TPL_PLAN_PARTIAL.render(
+        **_dump_for_prompt(req),
         frozen_meals=[m.model_dump() for m in frozen_meals],
         slots_to_generate=slots_to_generate,
     )
@@ -85,9 +96,8 @@ async def generate_single_day_rag(req: MealPlanRequest, session: AsyncSession) -
 
     recipes = await retrieve_recipes(session, retrieval_query, k=10)
 
-    template = _prompts_env.get_template("meal_plan_rag.jinja")
-    user_prompt = template.render(
-        **req.model_dump(),
+    user_prompt = _TPL_PLAN_RAG.render(
+        **_dump_for_prompt(req),
         retrieved_recipes=recipes,
     )
 
@@ -1,14 +1,12 @@
 import asyncio
 import io
-from pathlib import Path
 
 from fastapi import HTTPException
-from jinja2 import FileSystemLoader
-from jinja2.sandbox import SandboxedEnvironment
 from pypdf import PdfReader
 from pypdf.errors import PdfReadError
 
 from app.core.config import settings
+from app.core.prompts import load_prompt
 from app.llm.client import llm_client
 from app.models.plan_models import (
     NormalizationResponse,
@@ -24,10 +22,9 @@ logger = logging.getLogger(__name__)
 MAX_PDF_PAGES = 10
 MIN_EXTRACTABLE_CHARS = 50
 
-_prompts_env = SandboxedEnvironment(
-    loader=FileSystemLoader(str(Path(__file__).resolve().parents[2] / "prompts")),
-    autoescape=False,
-)
+_TPL_RECEIPT_IMAGE = load_prompt("receipt_scan.jinja")
+_TPL_RECEIPT_TEXT = load_prompt("receipt_scan_text.jinja")
+_TPL_NORMALIZE = load_prompt("normalize_names.jinja")
 
 SYSTEM_PROMPT = (
     "You are an expert at reading grocery receipts. "
@@ -42,8 +39,7 @@ async def extract_items_from_receipt(
     language: str = "English",
 ) -> ReceiptScanResponse:
     """Send a receipt image to the LLM and return structured grocery items."""
-    template = _prompts_env.get_template("receipt_scan.jinja")
-    user_prompt = template.render(language=language)
+    user_prompt = _TPL_RECEIPT_IMAGE.render(language=language)
 
     return await llm_client.chat_vision_json(
         system_prompt=SYSTEM_PROMPT,
@@ -102,8 +98,7 @@ async def extract_items_from_pdf(pdf_bytes: bytes, language: str = "English") ->
     """Extract grocery items from a PDF receipt using text extraction + LLM."""
     receipt_text = await asyncio.to_thread(_extract_pdf_text, pdf_bytes)
 
-    template = _prompts_env.get_template("receipt_scan_text.jinja")
-    user_prompt = template.render(receipt_text=receipt_text, language=language)
+    user_prompt = _TPL_RECEIPT_TEXT.render(receipt_text=receipt_text, language=language)
 
     return await llm_client.chat_json(
         system_prompt=PDF_SYSTEM_PROMPT,
@@ -131,8 +126,7 @@ async def normalize_item_names(
 
     scanned_names = [item.name for item in scanned_items]
 
-    template = _prompts_env.get_template("normalize_names.jinja")
-    user_prompt = template.render(
+    user_prompt = _TPL_NORMALIZE.render(
         fridge_names=fridge_item_names,
         scanned_names=scanned_names,
     )
@@ -1,4 +1,6 @@
-from typing import List
+import asyncio
+from functools import lru_cache
+from typing import List, Protocol
 from fastembed import TextEmbedding
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -17,11 +19,34 @@ def get_embedding_model() -> TextEmbedding:
     return _model
 
 
-def _row_to_recipe(row: RecipeRow) -> Recipe:
+@lru_cache(maxsize=1024)
+def _encode_query(query: str) -> tuple[float, ...]:
+    """Embed a retrieval query; identical fridges produce identical queries, so memoize."""
+    return tuple(next(iter(get_embedding_model().embed([query]))).tolist())
+
+
+def warm_up_embedding_model() -> None:
+    """Load the model and run one embed so the first real query doesn't pay the ONNX session init."""
+    list(get_embedding_model().embed(["warmup"]))
+
+
+class _RecipeFields(Protocol):
+    """The columns a Recipe is built from (a RecipeRow or a column-only result row)."""
+    @property
+    def id(self) -> int | None: ...
+    @property
+    def title(self) -> str: ...
+    @property
+    def ingredients_text(self) -> str: ...
+    @property
+    def steps_text(self) -> str: ...
+
+
+def _row_to_recipe(row: _RecipeFields) -> Recipe:
     return Recipe(
         id=row.id,  # type: ignore[arg-type]
         title=row.title,
-        ingredients=[p.strip() for p in row.ingredients_text.split(";") if p.strip()],
+        ingredients=[part for p in row.ingredients_text.split(";") if (part := p.strip())],
         steps=[s for s in row.steps_text.splitlines() if s.strip()],
     )
 
@@ -30,17 +55,17 @@ async def retrieve_recipes(session: AsyncSession, query: str, k: int = 5) -> Lis
     """
     Retrieve top-k recipes natively using PostgreSQL pgvector.
     """
-    model = get_embedding_model()
-    query_emb_generator = model.embed([query])
-    query_emb = list(query_emb_generator)[0].tolist()
+    # ONNX inference is CPU-bound; run it off the event loop
+    query_emb = list(await asyncio.to_thread(_encode_query, query))
 
+    # The embedding is only needed for ordering — don't ship 384 floats per row back
     stmt = (
-        select(RecipeRow)
+        select(RecipeRow.id, RecipeRow.title, RecipeRow.ingredients_text, RecipeRow.steps_text)
         .order_by(RecipeRow.embedding.cosine_distance(query_emb))  # type: ignore[attr-defined]
         .limit(k)
     )
 
     result = await session.execute(stmt)
-    rows = result.scalars().all()
+    rows = result.all()
 
     return [_row_to_recipe(r) for r in rows]
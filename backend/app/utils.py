@@ -16,14 +16,6 @@ def compute_shopping_list_from_plan(
     Any ingredient that is fully covered by the fridge will not appear
     in the shopping list.
     """
-    # Sum required grams per ingredient over all days and meals
-    required: dict[str, float] = defaultdict(float)
-    for day in days:
-        for meal in day.meals:
-            for ing in meal.ingredients:
-                key = ing.name.lower()
-                required[key] += ing.quantity_grams
-
     # Initial fridge amounts
     available: dict[str, float] = {}
     pretty_name: dict[str, str] = {}
@@ -33,20 +25,20 @@ def compute_shopping_list_from_plan(
         # remember original casing
         pretty_name.setdefault(key, item.name)
 
-    # Compute what we actually need to buy
-    shopping: List[IngredientAmount] = []
-    for key, needed in required.items():
-        have = available.get(key, 0.0)
-        missing = needed - have
-        if missing > 1e-6:
-            shopping.append(
-                IngredientAmount(
-                    name=pretty_name.get(key, key),
-                    quantity_grams=missing,
-                )
-            )
-
-    return shopping
+    # Sum required grams per ingredient over all days and meals (first-seen order)
+    required: dict[str, float] = {}
+    for day in days:
+        for meal in day.meals:
+            for ing in meal.ingredients:
+                key = ing.name.lower()
+                required[key] = required.get(key, 0.0) + ing.quantity_grams
+
+    # Buy only what the fridge does not cover
+    return [
+        IngredientAmount(name=pretty_name.get(key, key), quantity_grams=missing)
+        for key, needed in required.items()
+        if (missing := needed - available.get(key, 0.0)) > 1e-6
+    ]
 
 
 def subtract_used_from_fridge(
@@ -11,7 +11,7 @@ from app.models.db_models import User
 from app.core.security import get_password_hash, create_access_token
 from app.core.rate_limit import limiter
 from app.db import get_session
-from app.api.deps import get_current_user
+from app.api.deps import _user_cache, get_current_user, get_current_user_id
 
 TEST_DATABASE_URL = os.environ.get(
     "TEST_DATABASE_URL",
@@ -47,6 +47,14 @@ def _disable_rate_limiting():
     limiter.enabled = True
 
 
+@pytest.fixture(autouse=True)
+def _clear_user_cache():
+    """Each test rolls its DB back, so cached user snapshots must not outlive it."""
+    _user_cache.clear()
+    yield
+    _user_cache.clear()
+
+
 @pytest.fixture
 async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
     """
@@ -77,11 +85,17 @@ async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
         await conn.rollback()
 
 
+@pytest.fixture(scope="session")
+def test_password_hash() -> str:
+    """bcrypt is deliberately slow (~0.3 s); hash the shared test password once per run."""
+    return get_password_hash(TEST_PASSWORD)
+
+
 @pytest.fixture
-async def test_user(db_session: AsyncSession) -> User:
+async def test_user(db_session: AsyncSession, test_password_hash: str) -> User:
     user = User(
         email=TEST_EMAIL,
-        hashed_password=get_password_hash(TEST_PASSWORD),
+        hashed_password=test_password_hash,
     )
     db_session.add(user)
     await db_session.flush()
@@ -107,8 +121,12 @@ async def client(
     async def override_get_current_user():
         return test_user
 
+    async def override_get_current_user_id():
+        return test_user.id
+
     app.dependency_overrides[get_session] = override_get_session
     app.dependency_overrides[get_current_user] = override_get_current_user
+    app.dependency_overrides[get_current_user_id] = override_get_current_user_id
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
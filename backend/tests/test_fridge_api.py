@@ -26,6 +26,25 @@ class TestFridgeCRUD:
         assert by_name["chicken breast"]["need_to_use"] is True
         assert by_name["rice"]["quantity_grams"] == 500.0
 
+    async def test_put_response_matches_get(self, client: AsyncClient, auth_headers: dict):
+        """PUT returns the stored state directly, including the near-expiry auto-tick."""
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        payload = [
+            {"name": "milk", "quantity_grams": 500, "need_to_use": False, "expiration_date": tomorrow},
+            {"name": "rice", "quantity_grams": 1000},
+            {"name": "empty", "quantity_grams": 0},
+        ]
+        put_resp = await client.put("/api/fridge", headers=auth_headers, json=payload)
+        assert put_resp.status_code == 200
+
+        get_resp = await client.get("/api/fridge", headers=auth_headers)
+        # GET has no ORDER BY, so compare as sets of rows
+        put_items = sorted(put_resp.json(), key=lambda x: x["name"])
+        get_items = sorted(get_resp.json(), key=lambda x: x["name"])
+        assert put_items == get_items
+        assert [x["name"] for x in put_items] == ["milk", "rice"]
+        assert put_items[0]["need_to_use"] is True
+
     async def test_put_replaces_not_appends(
         self, client: AsyncClient, auth_headers: dict
     ):
@@ -41,6 +60,32 @@ class TestFridgeCRUD:
         assert "rice" in names
         assert "chicken" not in names
 
+    async def test_put_keeps_unchanged_rows(
+        self, client: AsyncClient, auth_headers: dict, db_session
+    ):
+        """Identical items keep their row; only changed items are rewritten."""
+        from sqlmodel import select
+        from app.models.db_models import StockItem
+
+        async def ids_by_name() -> dict[str, int]:
+            result = await db_session.execute(select(StockItem.name, StockItem.id))
+            return {name: id_ for name, id_ in result.all()}
+
+        payload = [
+            {"name": "rice", "quantity_grams": 500},
+            {"name": "milk", "quantity_grams": 300},
+        ]
+        await client.put("/api/fridge", headers=auth_headers, json=payload)
+        before = await ids_by_name()
+
+        payload[1]["quantity_grams"] = 100
+        resp = await client.put("/api/fridge", headers=auth_headers, json=payload)
+        after = await ids_by_name()
+
+        assert after["rice"] == before["rice"]
+        assert after["milk"] != before["milk"]
+        assert [x["quantity_grams"] for x in resp.json()] == [500, 100]
+
     async def test_put_negative_quantity_ignored(
         self, client: AsyncClient, auth_headers: dict
     ):
@@ -260,3 +305,119 @@ class TestFIFOSubtraction:
         assert len(milk_items) == 2
         assert milk_items[0].quantity_grams == 100  # smaller batch reduced
         assert milk_items[1].quantity_grams == 300  # larger batch untouched
+
+
+    async def test_repeated_ingredients_are_totalled(
+        self, client: AsyncClient, auth_headers: dict, test_user, db_session
+    ):
+        """The same ingredient in several meals deducts its total across batches."""
+        from app.api.fridge import subtract_ingredients_from_fridge, replace_fridge_items
+        from app.models.plan_models import StockItemDTO, IngredientAmount
+
+        assert test_user.id is not None
+        user_id = test_user.id
+        await replace_fridge_items(db_session, user_id, [
+            StockItemDTO(name="milk", quantity_grams=100, expiration_date=date(2026, 3, 13)),
+            StockItemDTO(name="milk", quantity_grams=500, expiration_date=date(2026, 3, 20)),
+        ])
+
+        result = await subtract_ingredients_from_fridge(
+            db_session, user_id,
+            [
+                IngredientAmount(name="milk", quantity_grams=60),
+                IngredientAmount(name="Milk ", quantity_grams=60),
+            ],
+        )
+        assert len(result) == 1
+        assert result[0].quantity_grams == 480
+        assert result[0].expiration_date == date(2026, 3, 20)
+
+    async def test_subtract_stores_auto_ticked_need_to_use(
+        self, client: AsyncClient, auth_headers: dict, test_user, db_session
+    ):
+        """The near-expiry tick in the subtract response is written to the rows too."""
+        from sqlmodel import select
+        from app.api.fridge import subtract_ingredients_from_fridge, replace_fridge_items
+        from app.models.db_models import StockItem
+        from app.models.plan_models import StockItemDTO, IngredientAmount
+
+        assert test_user.id is not None
+        user_id = test_user.id
+        tomorrow = date.today() + timedelta(days=1)
+        await replace_fridge_items(db_session, user_id, [
+            StockItemDTO(name="milk", quantity_grams=500, need_to_use=False, expiration_date=tomorrow),
+            StockItemDTO(name="eggs", quantity_grams=300, need_to_use=False, expiration_date=tomorrow),
+        ])
+
+        result = await subtract_ingredients_from_fridge(
+            db_session, user_id,
+            [IngredientAmount(name="milk", quantity_grams=100)],
+        )
+        assert all(item.need_to_use for item in result)
+
+        rows = (await db_session.execute(
+            select(StockItem).where(StockItem.user_id == user_id)
+        )).scalars().all()
+        assert {row.name: row.need_to_use for row in rows} == {"milk": True, "eggs": True}
+
+    async def test_subtract_updates_rows_in_place(
+        self, client: AsyncClient, auth_headers: dict, test_user, db_session
+    ):
+        """Partly used and untouched batches keep their ids; emptied ones are deleted."""
+        from sqlmodel import select
+        from app.api.fridge import subtract_ingredients_from_fridge, replace_fridge_items
+        from app.models.db_models import StockItem
+        from app.models.plan_models import StockItemDTO, IngredientAmount
+
+        assert test_user.id is not None
+        user_id = test_user.id
+        await replace_fridge_items(db_session, user_id, [
+            StockItemDTO(name="milk", quantity_grams=100, expiration_date=date(2026, 3, 13)),
+            StockItemDTO(name="milk", quantity_grams=500, expiration_date=date(2026, 3, 20)),
+            StockItemDTO(name="rice", quantity_grams=400),
+        ])
+        rows = (await db_session.execute(select(StockItem))).scalars().all()
+        ids = {(r.name, r.quantity_grams): r.id for r in rows}
+
+        await subtract_ingredients_from_fridge(
+            db_session, user_id,
+            [IngredientAmount(name="Milk", quantity_grams=250)],
+        )
+        result = await db_session.execute(
+            select(StockItem.id, StockItem.name, StockItem.quantity_grams)
+        )
+        after = {row.id: (row.name, row.quantity_grams) for row in result.all()}
+        assert after == {
+            ids[("milk", 500)]: ("milk", 350),
+            ids[("rice", 400)]: ("rice", 400),
+        }
+
+
+class TestTokenOnlyAuth:
+    """Fridge endpoints trust the JWT's user id and only hit the user row when needed."""
+
+    async def test_unknown_user_get_returns_401(self, unauthed_client: AsyncClient, test_user):
+        from app.core.security import create_access_token
+
+        headers = {"Authorization": f"Bearer {create_access_token(subject=test_user.id + 10_000)}"}
+        resp = await unauthed_client.get("/api/fridge", headers=headers)
+        assert resp.status_code == 401
+
+    async def test_unknown_user_put_returns_401(self, unauthed_client: AsyncClient, test_user):
+        from app.core.security import create_access_token
+
+        headers = {"Authorization": f"Bearer {create_access_token(subject=test_user.id + 10_000)}"}
+        resp = await unauthed_client.put(
+            "/api/fridge", headers=headers, json=[{"name": "rice", "quantity_grams": 100}],
+        )
+        assert resp.status_code == 401
+
+    async def test_real_token_without_override(self, unauthed_client: AsyncClient, auth_headers: dict):
+        put_resp = await unauthed_client.put(
+            "/api/fridge", headers=auth_headers, json=[{"name": "rice", "quantity_grams": 100}],
+        )
+        assert put_resp.status_code == 200
+
+        get_resp = await unauthed_client.get("/api/fridge", headers=auth_headers)
+        assert get_resp.status_code == 200
+        assert get_resp.json()[0]["name"] == "rice"
@@ -49,3 +49,10 @@ class TestMealHistory:
         assert history[0]["meal_type"] == "lunch"
         assert "meal_entry_id" in history[0]
         assert "meal_plan_id" in history[0]
+
+    async def test_unknown_user_returns_401(self, unauthed_client: AsyncClient, test_user):
+        from app.core.security import create_access_token
+
+        headers = {"Authorization": f"Bearer {create_access_token(subject=test_user.id + 10_000)}"}
+        resp = await unauthed_client.get("/api/meals", headers=headers)
+        assert resp.status_code == 401
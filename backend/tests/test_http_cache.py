@@ -0,0 +1,78 @@
+from fastapi import BackgroundTasks, FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.core.http_cache import _matches, etag_middleware
+
+
+class TestETag:
+    async def test_get_fridge_sets_etag(self, client: AsyncClient):
+        resp = await client.get("/api/fridge")
+        assert resp.status_code == 200
+        assert resp.headers["etag"].startswith('"')
+
+    async def test_matching_if_none_match_returns_304(self, client: AsyncClient):
+        first = await client.get("/api/users")
+        etag = first.headers["etag"]
+
+        resp = await client.get("/api/users", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    async def test_etag_changes_after_write(self, client: AsyncClient):
+        first = await client.get("/api/fridge")
+        etag = first.headers["etag"]
+
+        await client.put("/api/fridge", json=[
+            {"name": "milk", "quantity_grams": 200},
+        ])
+
+        resp = await client.get("/api/fridge", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert resp.json()[0]["name"] == "milk"
+
+    async def test_non_listed_paths_have_no_etag(self, client: AsyncClient):
+        resp = await client.get("/health")
+        assert "etag" not in resp.headers
+
+    async def test_rebuilt_response_keeps_repeated_headers_and_background(self):
+        ran: list[str] = []
+        app = FastAPI()
+        app.middleware("http")(etag_middleware)
+
+        @app.get("/api/users")
+        async def users(response: Response, tasks: BackgroundTasks) -> dict:
+            response.set_cookie("a", "1")
+            response.set_cookie("b", "2")
+            tasks.add_task(ran.append, "done")
+            return {"ok": True}
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            resp = await ac.get("/api/users")
+            assert resp.headers.get_list("set-cookie") == ["a=1; Path=/; SameSite=lax", "b=2; Path=/; SameSite=lax"]
+            assert ran == ["done"]
+
+            resp = await ac.get("/api/users", headers={"If-None-Match": resp.headers["etag"]})
+            assert resp.status_code == 304
+            assert len(resp.headers.get_list("set-cookie")) == 2
+            assert ran == ["done", "done"]
+
+    def test_matches_handles_lists_and_weak_tags(self):
+        assert _matches('"a", W/"b"', '"b"')
+        assert _matches("*", '"x"')
+        assert not _matches('"a"', '"b"')
+
+
+class TestCacheControl:
+    async def test_read_gets_require_revalidation(self, client: AsyncClient):
+        for path in ("/api/fridge", "/api/meals", "/api/users"):
+            resp = await client.get(path)
+            assert resp.headers["cache-control"] == "private, no-cache", path
+
+    async def test_writes_are_no_cache(self, client: AsyncClient):
+        resp = await client.put("/api/fridge", json=[])
+        assert resp.headers["cache-control"] == "no-cache"
+
+        resp = await client.patch("/api/users", json={"country": "Czechia"})
+        assert resp.headers["cache-control"] == "no-cache"
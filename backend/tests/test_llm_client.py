@@ -95,6 +95,19 @@ class TestMockMode:
         assert len(result.meals) == 1
 
 
+class TestClientLifecycle:
+    @patch("app.llm.client.settings")
+    async def test_aclose_closes_openai_compatible_sdk_clients(self, mock_settings: MagicMock) -> None:
+        mock_settings.openai_api_key = "sk-test"
+        mock_settings.deepseek_api_key = "sk-test"
+        mock_settings.gemini_api_key = None
+        client = LLMClient()
+
+        assert len(client._sdk_clients) == 2
+        await client.aclose()
+        assert all(sdk.is_closed() for sdk in client._sdk_clients)
+
+
 class TestIsQuotaError:
     """Tests for _is_quota_error helper — Gemini and OpenAI."""
 
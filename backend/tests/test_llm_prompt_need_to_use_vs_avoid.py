@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple, cast
 
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 from app.core.config import settings
+from app.db import engine
 from app.main import app
 
 
@@ -25,8 +29,10 @@ if not RUN_LLM_TESTS or LLM_MOCK:
         allow_module_level=True,
     )
 
-# Delay between requests to reduce rate-limit / overload issues.
+# Minimum spacing between LLM request starts to reduce rate-limit / overload issues.
 REQUEST_DELAY_S = float(os.getenv("LLM_TEST_DELAY_S", "1.5"))
+# Scenarios in flight at once; keep under the provider's per-key concurrency limit.
+MAX_CONCURRENCY = int(os.getenv("LLM_TEST_CONCURRENCY", "4"))
 
 # Cache responses to avoid repeatedly paying for 50 LLM calls on every run.
 CACHE_DIR = Path(__file__).parent / "llm_snapshots" / "need_to_use_vs_avoid"
@@ -51,26 +57,26 @@ AVOID_ALIASES: Dict[str, str] = {
     "eggs": "egg",
 }
 
-AVOID_EXPANSIONS: Dict[str, Set[str]] = {
+AVOID_EXPANSIONS: Dict[str, FrozenSet[str]] = {
     # Category term -> terms to search in response
-    "fish": {
+    "fish": frozenset({
         "fish",
         "carp", "salmon", "tuna", "cod", "sardine", "sardines", "anchovy", "anchovies",
         "tilapia", "mackerel", "trout",
         "fish sauce",
-    },
-    "shellfish": {
+    }),
+    "shellfish": frozenset({
         "shellfish",
         "shrimp", "prawn", "crab", "lobster", "mussel", "mussels", "oyster", "oysters", "clam", "clams",
-    },
-    "seafood": {
+    }),
+    "seafood": frozenset({
         "seafood",
         # include fish + shellfish terms
         "fish",
         "carp", "salmon", "tuna", "cod", "sardine", "sardines", "anchovy", "anchovies",
         "shrimp", "prawn", "crab", "lobster", "mussel", "mussels", "oyster", "oysters", "clam", "clams",
-    },
-    "legume": {
+    }),
+    "legume": frozenset({
         "legume", "legumes",
         "lentil", "lentils",
         "chickpea", "chickpeas",
@@ -82,20 +88,20 @@ AVOID_EXPANSIONS: Dict[str, Set[str]] = {
         "peanut", "peanuts",
         "edamame",
         "hummus",
-    },
-    "soy": {
+    }),
+    "soy": frozenset({
         "soy", "soya",
         "tofu", "tempeh", "edamame",
         "soy sauce", "miso", "miso paste",
-    },
-    "dairy": {
+    }),
+    "dairy": frozenset({
         "dairy",
         "milk",
         "cheese", "cheddar", "mozzarella", "parmesan",
         "yogurt", "yoghurt",
         "butter", "cream",
-    },
-    "gluten": {
+    }),
+    "gluten": frozenset({
         "gluten",
         "wheat", "wheat flour", "flour",
         "barley", "rye",
@@ -103,8 +109,8 @@ AVOID_EXPANSIONS: Dict[str, Set[str]] = {
         "pasta", "noodles",
         "couscous",
         "seitan",
-    },
-    "nut": {
+    }),
+    "nut": frozenset({
         "nut", "nuts",
         "almond", "almonds",
         "cashew", "cashews",
@@ -112,19 +118,19 @@ AVOID_EXPANSIONS: Dict[str, Set[str]] = {
         "hazelnut", "hazelnuts",
         "peanut", "peanuts",
         "peanut butter",
-    },
-    "egg": {
+    }),
+    "egg": frozenset({
         "egg", "eggs",
-    },
-    "pork": {
+    }),
+    "pork": frozenset({
         "pork",
         "bacon", "ham", "sausage", "prosciutto",
-    },
-    "sesame": {
+    }),
+    "sesame": frozenset({
         "sesame",
         "sesame oil",
         "tahini",
-    },
+    }),
 }
 
 
@@ -139,42 +145,54 @@ def _canonical_avoid(term: str) -> str:
 
 def _terms_for_avoid(avoid_term: str) -> Set[str]:
     canon = _canonical_avoid(avoid_term)
-    terms = set(AVOID_EXPANSIONS.get(canon, set()))
     # Always include the raw + canonical term too (so we search the explicit avoid word).
-    terms.add(_norm(avoid_term))
-    terms.add(canon)
+    terms = AVOID_EXPANSIONS.get(canon, frozenset()) | {_norm(avoid_term), canon}
     # Remove empty strings
     return {t for t in terms if t}
 
 
-def _text_contains_term(text: str, term: str) -> bool:
+@lru_cache(maxsize=None)
+def _avoid_pattern(avoid_term: str) -> re.Pattern[str]:
     """
-    Word-ish boundary match.
-    Works for single and multi-word terms.
+    One word-ish boundary alternation over avoid_term + its expansions, so the response
+    is scanned once per scenario instead of once per term.
+    Longest terms first so "peanut butter" wins over "peanut" at the same position.
     """
-    t = _norm(term)
-    if not t:
-        return False
-    # Regex boundary at ends; for multiword this still works reasonably.
-    pattern = r"\b" + re.escape(t) + r"\b"
-    return re.search(pattern, text) is not None
+    terms = sorted(_terms_for_avoid(avoid_term), key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(re.escape(t) for t in terms) + r")\b")
+
+
+# Every scenario draws from the same few categories; compile them once up front.
+for _canon in AVOID_EXPANSIONS:
+    _avoid_pattern(_canon)
+
+
+def _iter_strings(obj: object) -> Iterable[str]:
+    """Yield the string leaves of a decoded JSON value (dict keys are schema, not content)."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _iter_strings(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _iter_strings(v)
 
 
 def _find_hits_in_response(response_json: dict, avoid_term: str) -> List[str]:
     """
-    Search full response text for avoid_term + synonyms/hyponyms.
+    Search every text field of the response for avoid_term + synonyms/hyponyms.
     This follows your idea: "search the avoid word and its synonyms/hyponyms in the response".
     """
-    response_text = json.dumps(response_json, ensure_ascii=False).lower()
-    hits: List[str] = []
-    for term in sorted(_terms_for_avoid(avoid_term)):
-        if _text_contains_term(response_text, term):
-            hits.append(term)
-    return hits
+    response_text = "\n".join(_iter_strings(response_json)).lower()
+    return sorted({m.group(0) for m in _avoid_pattern(avoid_term).finditer(response_text)})
+
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
 
 
 def _slug(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "_", _norm(s)).strip("_")
+    return _SLUG_RE.sub("_", _norm(s)).strip("_")
 
 
 # 50 conflict scenarios (need_to_use ingredient that is inside the avoid category)
@@ -231,69 +249,101 @@ SCENARIOS: List[Tuple[str, str]] = [
     ("tahini", "sesame"),
 ]
 
+# (index, need_to_use, avoid, snapshot path), built once; the path stem doubles as the test id.
+SCENARIO_JOBS: List[Tuple[int, str, str, Path]] = [
+    (idx, n, a, CACHE_DIR / f"{idx:02d}__{_slug(n)}__avoid_{_slug(a)}.json")
+    for idx, (n, a) in enumerate(SCENARIOS, start=1)
+]
 
-@pytest.fixture(scope="session")
-def client() -> TestClient:
-    return TestClient(app)
 
+# Safe staples added to every scenario's fridge so the model has alternatives.
+FRIDGE_STAPLES: Tuple[Dict[str, object], ...] = (
+    {"name": "rice", "quantity_grams": 600, "need_to_use": False},
+    {"name": "spinach", "quantity_grams": 200, "need_to_use": False},
+)
+
+
+class _Throttle:
+    """Space LLM request starts at least `interval` seconds apart across all workers."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = asyncio.Lock()
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self._interval
+
+
+def _scenario_email(idx: int) -> str:
+    # One user per scenario: the plan endpoint plans from the user's stored fridge,
+    # so concurrent scenarios must not share one.
+    local, _, domain = os.getenv("LLM_TEST_EMAIL", "llm_prompt_tests@example.com").partition("@")
+    return f"{local}+{idx:02d}@{domain}"
+
+
+async def _run_scenario(
+    client: AsyncClient,
+    sem: asyncio.Semaphore,
+    throttle: _Throttle,
+    snapshots: Set[str],
+    idx: int,
+    need_to_use_item: str,
+    avoid_term: str,
+    cache_path: Path,
+) -> str | None:
+    """Plan one scenario (or load its snapshot) and return a failure message, if any."""
+    if cache_path.name in snapshots and not OVERWRITE_CACHE:
+        # Snapshot hit: pure validation, no user/fridge/plan calls at all
+        # json.loads takes the UTF-8 bytes directly; no intermediate str copy
+        cached = json.loads(cache_path.read_bytes())
+        response_json = cached["response"]
+    else:
+        async with sem:
+            # Create or login a user (matches frontend behavior) :contentReference[oaicite:2]{index=2}
+            r = await client.post("/api/users/", params={"email": _scenario_email(idx)})
+            if r.status_code != 200:
+                return f"[{idx}] create user failed: {r.status_code} {r.text}"
+            user_id = int(r.json())
+
+            fridge = [
+                {"name": need_to_use_item, "quantity_grams": 200, "need_to_use": True},
+                *FRIDGE_STAPLES,
+            ]
+
+            # Ensure backend fridge state is set
+            rf = await client.put(f"/api/users/{user_id}/fridge", json=fridge)
+            if rf.status_code != 200:
+                return (
+                    f"[{idx}] PUT fridge failed ({need_to_use_item=} {avoid_term=}): "
+                    f"{rf.status_code} {rf.text}"
+                )
 
-def test_llm_prompt_need_to_use_vs_avoid_consistency(client: TestClient) -> None:
-    """
-    Sequentially calls the real LLM via backend planning endpoint and validates:
-    The response must not contain avoid_term nor its synonyms/hyponyms.
-    """
-    # Create or login a user (matches frontend behavior) :contentReference[oaicite:2]{index=2}
-    email = os.getenv("LLM_TEST_EMAIL", "llm_prompt_tests@example.com")
-    r = client.post("/api/users/", params={"email": email})
-    assert r.status_code == 200, r.text
-    user_id = int(r.json())
-
-    failures: List[str] = []
-
-    for idx, (need_to_use_item, avoid_term) in enumerate(SCENARIOS, start=1):
-        # Prepare fridge: include a couple of safe staples so the model has alternatives.
-        fridge = [
-            {"name": need_to_use_item, "quantity_grams": 200, "need_to_use": True},
-            {"name": "rice", "quantity_grams": 600, "need_to_use": False},
-            {"name": "spinach", "quantity_grams": 200, "need_to_use": False},
-        ]
-
-        # Ensure backend fridge state is set
-        rf = client.put(f"/api/users/{user_id}/fridge", json=fridge)
-        if rf.status_code != 200:
-            failures.append(
-                f"[{idx}] PUT fridge failed ({need_to_use_item=} {avoid_term=}): "
-                f"{rf.status_code} {rf.text}"
-            )
-            continue
-
-        request_body = {
-            "ingredients": fridge,
-            "taste_preferences": [],
-            "avoid_ingredients": [avoid_term],
-            "diet_type": None,
-            "meals_per_day": 1,
-            "people_count": 1,
-            "past_meals": [],
-        }
-
-        cache_path = CACHE_DIR / f"{idx:02d}__{_slug(need_to_use_item)}__avoid_{_slug(avoid_term)}.json"
-
-        if cache_path.exists() and not OVERWRITE_CACHE:
-            cached = json.loads(cache_path.read_text(encoding="utf-8"))
-            response_json = cached["response"]
-        else:
+            request_body = {
+                "ingredients": fridge,
+                "taste_preferences": [],
+                "avoid_ingredients": [avoid_term],
+                "diet_type": None,
+                "meals_per_day": 1,
+                "people_count": 1,
+                "past_meals": [],
+            }
+
+            await throttle.wait()
             # Call plan endpoint (matches frontend behavior) :contentReference[oaicite:3]{index=3}
-            rp = client.post(f"/api/users/{user_id}/plan?days=1", json=request_body)
+            rp = await client.post(f"/api/users/{user_id}/plan?days=1", json=request_body)
 
             if rp.status_code != 200:
-                failures.append(
+                # Back off a bit (holding the slot) to avoid hammering when errors happen
+                await asyncio.sleep(max(REQUEST_DELAY_S, 2.0))
+                return (
                     f"[{idx}] PLAN failed ({need_to_use_item=} {avoid_term=}): "
                     f"{rp.status_code} {rp.text}"
                 )
-                # Back off a bit to avoid hammering when errors happen
-                time.sleep(max(REQUEST_DELAY_S, 2.0))
-                continue
 
             response_json = rp.json()
 
@@ -308,14 +358,66 @@ def test_llm_prompt_need_to_use_vs_avoid_consistency(client: TestClient) -> None
                 encoding="utf-8",
             )
 
-            time.sleep(REQUEST_DELAY_S)
-
-        # Validator: search avoid_term + synonyms/hyponyms in full response JSON
-        hits = _find_hits_in_response(response_json, avoid_term)
-        if hits:
-            failures.append(
-                f"[{idx}] VIOLATION: avoid='{avoid_term}' need_to_use='{need_to_use_item}' "
-                f"-> found terms in response: {hits}. Snapshot: {cache_path.name}"
-            )
-
-    assert not failures, "LLM prompt consistency violations:\n" + "\n".join(failures)
+    # Validator: search avoid_term + synonyms/hyponyms in full response JSON
+    hits = _find_hits_in_response(response_json, avoid_term)
+    if hits:
+        return (
+            f"[{idx}] VIOLATION: avoid='{avoid_term}' need_to_use='{need_to_use_item}' "
+            f"-> found terms in response: {hits}. Snapshot: {cache_path.name}"
+        )
+    return None
+
+
+async def _run_scenarios(selected: Set[int]) -> Dict[int, str]:
+    """Run the selected scenarios, up to MAX_CONCURRENCY at a time; map index -> failure."""
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    throttle = _Throttle(REQUEST_DELAY_S)
+    # One directory listing instead of a stat per scenario
+    snapshots = {entry.name for entry in os.scandir(CACHE_DIR)}
+    jobs = [job for job in SCENARIO_JOBS if job[0] in selected]
+
+    # No client timeout: a real plan call can take far longer than httpx's default 5 s.
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", timeout=None,
+    ) as client:
+        results = await asyncio.gather(*(
+            _run_scenario(client, sem, throttle, snapshots, *job) for job in jobs
+        ))
+
+    return {job[0]: msg for job, msg in zip(jobs, results) if msg is not None}
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def scenario_failures(request: pytest.FixtureRequest) -> Dict[int, str]:
+    """
+    Run every collected scenario in one concurrent batch (sharing the throttle), so the
+    per-scenario tests below only report. Honors -k / --lf selection. Runs on
+    pytest-asyncio's session loop, which stays open for the whole run.
+    """
+    selected: Set[int] = {
+        cast(int, item.callspec.params["idx"])
+        for item in request.session.items
+        if isinstance(item, pytest.Function)
+        and item.originalname == "test_llm_prompt_need_to_use_vs_avoid_consistency"
+    }
+    try:
+        return await _run_scenarios(selected)
+    finally:
+        # Drop the app engine's pooled connections so no later test reuses them
+        await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("idx", "need_to_use_item", "avoid_term"),
+    [(idx, n, a) for idx, n, a, _ in SCENARIO_JOBS],
+    ids=[path.stem for *_, path in SCENARIO_JOBS],
+)
+def test_llm_prompt_need_to_use_vs_avoid_consistency(
+    scenario_failures: Dict[int, str], idx: int, need_to_use_item: str, avoid_term: str,
+) -> None:
+    """
+    Calls the real LLM via backend planning endpoint and validates:
+    The response must not contain avoid_term nor its synonyms/hyponyms.
+    """
+    failure = scenario_failures.get(idx)
+    assert failure is None, failure
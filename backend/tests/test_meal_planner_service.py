@@ -6,6 +6,9 @@ import pytest
 
 from typing import Any, Literal
 
+from jinja2 import meta
+
+from app.core.prompts import prompts_env
 from app.models.plan_models import (
     MealPlanRequest,
     SingleDayResponse,
@@ -13,7 +16,8 @@ from app.models.plan_models import (
     IngredientAmount,
     StockItemDTO,
 )
-from app.services.meal_planner import generate_single_day, generate_partial_day
+from app.models.recipes import Recipe
+from app.services.meal_planner import _dump_for_prompt, generate_single_day, generate_partial_day
 
 
 def _make_request(**overrides: Any) -> MealPlanRequest:
@@ -86,6 +90,16 @@ class TestGenerateSingleDay:
         # Template should render something non-empty
         assert len(user_prompt) > 0
 
+    @patch("app.services.meal_planner.llm_client")
+    async def test_day_number_only_in_prompt_when_given(self, mock_llm: MagicMock):
+        mock_llm.chat_json = AsyncMock(return_value=_make_single_day_response())
+
+        await generate_single_day(_make_request(), day_number=2, total_days=3)
+        assert "day 2 of 3" in mock_llm.chat_json.call_args.kwargs["user_prompt"]
+
+        await generate_single_day(_make_request())
+        assert "Plan position" not in mock_llm.chat_json.call_args.kwargs["user_prompt"]
+
 
 class TestGeneratePartialDay:
     @patch("app.services.meal_planner.llm_client")
@@ -180,3 +194,56 @@ class TestStockOnlyPrompt:
         call_kwargs = mock_llm.chat_json.call_args
         user_prompt = call_kwargs.kwargs["user_prompt"]
         assert "STOCK-ONLY MODE" in user_prompt
+
+
+# Template-only variables each meal-plan prompt receives besides the request fields
+_TEMPLATE_EXTRAS: dict[str, set[str]] = {
+    "meal_plan.jinja": {"day_number", "total_days"},
+    "meal_plan_partial.jinja": {"frozen_meals", "slots_to_generate"},
+    "meal_plan_rag.jinja": {"retrieved_recipes"},
+}
+
+
+def _template_extras(name: str) -> dict[str, Any]:
+    if name == "meal_plan_partial.jinja":
+        return {
+            "frozen_meals": [m.model_dump() for m in _make_single_day_response().meals],
+            "slots_to_generate": ["dinner"],
+        }
+    if name == "meal_plan_rag.jinja":
+        return {
+            "retrieved_recipes": [
+                Recipe(id=1, title="Curry", ingredients=["chicken", "rice"], steps=["Cook"]),
+            ],
+        }
+    return {}
+
+
+class TestPromptContext:
+    @pytest.mark.parametrize("name", sorted(_TEMPLATE_EXTRAS))
+    def test_templates_only_reference_known_variables(self, name: str):
+        """A variable missing from the context would render as "" via Jinja's Undefined."""
+        source = prompts_env.loader.get_source(prompts_env, name)[0]  # type: ignore[union-attr]
+        used = meta.find_undeclared_variables(prompts_env.parse(source))
+
+        assert used <= set(MealPlanRequest.model_fields) | _TEMPLATE_EXTRAS[name]
+
+    @pytest.mark.parametrize("name", sorted(_TEMPLATE_EXTRAS))
+    @pytest.mark.parametrize("stock_only", [False, True])
+    def test_render_matches_model_dump_context(self, name: str, stock_only: bool):
+        req = _make_request(
+            stock_items=[
+                StockItemDTO(name="chicken", quantity_grams=500, need_to_use=True),
+                StockItemDTO(name="rice", quantity_grams=1000),
+            ],
+            avoid_ingredients=["peanuts"],
+            past_meals=["Soup", "Stew"],
+            diet_type="vegetarian",
+            stock_only=stock_only,
+        )
+        template = prompts_env.get_template(name)
+        extras = _template_extras(name)
+
+        assert template.render(**_dump_for_prompt(req), **extras) == template.render(
+            **req.model_dump(), **extras
+        )
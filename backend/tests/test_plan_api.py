@@ -1,21 +1,25 @@
+import asyncio
+import json
 import logging
 from unittest.mock import AsyncMock, patch
 
 from httpx import AsyncClient
 
+from app.models.db_models import MealPlan
 from app.models.plan_models import (
     IngredientAmount,
+    MealPlanRequest,
     PlannedMeal,
     SingleDayResponse,
     MealPlanResponse,
 )
 
 
-def _fake_day() -> SingleDayResponse:
+def _fake_day(name: str = "Test Lunch") -> SingleDayResponse:
     return SingleDayResponse(
         meals=[
             PlannedMeal(
-                name="Test Lunch",
+                name=name,
                 meal_type="lunch",
                 ingredients=[
                     IngredientAmount(name="chicken breast", quantity_grams=300),
@@ -27,6 +31,11 @@ def _fake_day() -> SingleDayResponse:
     )
 
 
+def _fake_day_numbered(_req: MealPlanRequest, day_number: int, total_days: int) -> SingleDayResponse:
+    """Stand-in for the concurrent path: a distinct dish per day, so nothing is deduped."""
+    return _fake_day(f"Lunch {day_number}")
+
+
 class TestPlanGeneration:
     @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
     async def test_generate_one_day(
@@ -64,6 +73,172 @@ class TestPlanGeneration:
         assert len(body["days"]) == 3
         assert mock_gen.await_count == 3
 
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_independent_days_share_starting_fridge(
+        self, mock_gen: AsyncMock, client: AsyncClient, auth_headers: dict
+    ):
+        await client.put(
+            "/api/fridge",
+            headers=auth_headers,
+            json=[{"name": "chicken breast", "quantity_grams": 600}],
+        )
+        mock_gen.side_effect = _fake_day_numbered
+
+        resp = await client.post(
+            "/api/plan?days=3",
+            headers=auth_headers,
+            json={"meals_per_day": 1, "people_count": 2, "independent_days": True},
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert len(body["days"]) == 3
+        assert mock_gen.await_count == 3
+        # No day sees the previous day's consumption, but each knows which day it is
+        for day_number, call in enumerate(mock_gen.await_args_list, start=1):
+            (day_req,) = call.args
+            assert [s.quantity_grams for s in day_req.stock_items] == [600]
+            assert call.kwargs == {"day_number": day_number, "total_days": 3}
+        # 3 x 300 g chicken needed, 600 g in fridge
+        chicken = next(i for i in body["shopping_list"] if i["name"] == "chicken breast")
+        assert chicken["quantity_grams"] == 300
+
+    async def test_independent_days_are_generated_concurrently(
+        self, client: AsyncClient, auth_headers: dict
+    ):
+        in_flight = 0
+        peak = 0
+
+        async def fake_generate_single_day(
+            _req: MealPlanRequest, day_number: int, total_days: int,
+        ) -> SingleDayResponse:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _fake_day(f"Lunch {day_number}")
+
+        with patch("app.api.plan.generate_single_day", side_effect=fake_generate_single_day):
+            resp = await client.post(
+                "/api/plan?days=3",
+                headers=auth_headers,
+                json={"meals_per_day": 1, "people_count": 2, "independent_days": True},
+            )
+        assert resp.status_code == 200
+        assert len(resp.json()["days"]) == 3
+        # All three day calls were awaiting the LLM at the same time
+        assert peak == 3
+
+    @patch("app.api.plan.generate_partial_day", new_callable=AsyncMock)
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_independent_days_regenerate_repeated_meals(
+        self,
+        mock_gen: AsyncMock,
+        mock_partial: AsyncMock,
+        client: AsyncClient,
+        auth_headers: dict,
+    ):
+        # Every concurrent day comes back with the same dish
+        mock_gen.return_value = _fake_day("Chicken Rice")
+        mock_partial.side_effect = [_fake_day("Tofu Bowl"), _fake_day("Lentil Soup")]
+
+        resp = await client.post(
+            "/api/plan?days=3",
+            headers=auth_headers,
+            json={
+                "meals_per_day": 1, "people_count": 2, "independent_days": True,
+                "past_meals": ["Goulash"],
+            },
+        )
+        assert resp.status_code == 200
+        names = [day["meals"][0]["name"] for day in resp.json()["days"]]
+        assert names == ["Chicken Rice", "Tofu Bowl", "Lentil Soup"]
+
+        # Days 2 and 3 were retried together, each told about every kept meal
+        assert mock_partial.await_count == 2
+        for call in mock_partial.await_args_list:
+            assert call.args[0].past_meals == ["Goulash", "Chicken Rice"]
+
+    @patch("app.api.plan.generate_partial_day", new_callable=AsyncMock)
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_failed_dedupe_retry_keeps_repeated_meal(
+        self,
+        mock_gen: AsyncMock,
+        mock_partial: AsyncMock,
+        client: AsyncClient,
+        auth_headers: dict,
+    ):
+        mock_gen.return_value = _fake_day("Chicken Rice")
+        mock_partial.side_effect = [RuntimeError("provider down"), _fake_day("Tofu Bowl")]
+
+        resp = await client.post(
+            "/api/plan?days=3",
+            headers=auth_headers,
+            json={"meals_per_day": 1, "people_count": 2, "independent_days": True},
+        )
+        # Every day was generated; a failed dedupe retry only leaves a duplicate
+        assert resp.status_code == 200
+        names = [day["meals"][0]["name"] for day in resp.json()["days"]]
+        assert names == ["Chicken Rice", "Chicken Rice", "Tofu Bowl"]
+
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_independent_failure_logs_failing_day(
+        self, mock_gen: AsyncMock, client: AsyncClient, auth_headers: dict, caplog
+    ):
+        async def fail_on_day_two(_req, day_number: int, total_days: int) -> SingleDayResponse:
+            if day_number == 2:
+                raise RuntimeError("provider down")
+            return _fake_day(f"Lunch {day_number}")
+
+        mock_gen.side_effect = fail_on_day_two
+
+        with caplog.at_level(logging.ERROR, logger="app.api.plan"):
+            resp = await client.post(
+                "/api/plan?days=3",
+                headers=auth_headers,
+                json={"meals_per_day": 1, "people_count": 2, "independent_days": True},
+            )
+        assert resp.status_code == 502
+        assert any("failed at day 2" in r.getMessage() for r in caplog.records)
+
+
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_stored_request_omits_stock_items(
+        self, mock_gen: AsyncMock, client: AsyncClient, auth_headers: dict, db_session,
+    ):
+        mock_gen.return_value = _fake_day()
+
+        resp = await client.post(
+            "/api/plan?days=1",
+            headers=auth_headers,
+            json={
+                "meals_per_day": 1,
+                "people_count": 2,
+                "stock_items": [{"name": "rice", "quantity_grams": 500}],
+                "past_meals": ["Soup"],
+            },
+        )
+        plan = await db_session.get(MealPlan, resp.json()["plan_id"])
+        stored = json.loads(plan.request_json)
+        assert "stock_items" not in stored
+        assert stored["past_meals"] == ["Soup"]
+        # Still round-trips for regenerate
+        assert MealPlanRequest.model_validate_json(plan.request_json).stock_items == []
+
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_stored_response_is_the_response_body(
+        self, mock_gen: AsyncMock, client: AsyncClient, auth_headers: dict, db_session,
+    ):
+        mock_gen.return_value = _fake_day()
+
+        resp = await client.post(
+            "/api/plan?days=1",
+            headers=auth_headers,
+            json={"meals_per_day": 1, "people_count": 2},
+        )
+        plan = await db_session.get(MealPlan, resp.json()["plan_id"])
+        assert plan.response_json == resp.text
+
 
 class TestPlanConfirm:
     @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
@@ -191,6 +366,104 @@ class TestPlanRegenerate:
         # Unfrozen meal replaced
         assert body["days"][0]["meals"][1]["name"] == "New Dinner"
 
+    @patch("app.api.plan.generate_partial_day", new_callable=AsyncMock)
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_independent_days_regenerate_from_starting_fridge(
+        self,
+        mock_gen: AsyncMock,
+        mock_partial: AsyncMock,
+        client: AsyncClient,
+        auth_headers: dict,
+    ):
+        await client.put(
+            "/api/fridge",
+            headers=auth_headers,
+            json=[{"name": "chicken breast", "quantity_grams": 600}],
+        )
+        mock_gen.side_effect = _fake_day_numbered
+        plan_resp = await client.post(
+            "/api/plan?days=3",
+            headers=auth_headers,
+            json={"meals_per_day": 1, "people_count": 2, "independent_days": True},
+        )
+        plan_id = plan_resp.json()["plan_id"]
+
+        mock_partial.side_effect = [_fake_day("New Lunch 1"), _fake_day("New Lunch 3")]
+        regen_resp = await client.post(
+            f"/api/plan/{plan_id}/regenerate",
+            headers=auth_headers,
+            json={"frozen_meals": [{"day_index": 1, "meal_index": 0}]},
+        )
+        assert regen_resp.status_code == 200
+        assert len(regen_resp.json()["days"]) == 3
+        # Days 0 and 2 regenerated, each against the untouched fridge
+        assert mock_partial.await_count == 2
+        for call in mock_partial.await_args_list:
+            day_req = call.args[0]
+            assert [s.quantity_grams for s in day_req.stock_items] == [600]
+
+    @patch("app.api.plan.generate_partial_day", new_callable=AsyncMock)
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_independent_regenerate_redoes_repeated_meals(
+        self,
+        mock_gen: AsyncMock,
+        mock_partial: AsyncMock,
+        client: AsyncClient,
+        auth_headers: dict,
+    ):
+        mock_gen.side_effect = _fake_day_numbered
+        plan_resp = await client.post(
+            "/api/plan?days=3",
+            headers=auth_headers,
+            json={"meals_per_day": 1, "people_count": 2, "independent_days": True},
+        )
+        plan_id = plan_resp.json()["plan_id"]
+
+        # Both regenerated days collide with the frozen "Lunch 2", so both are retried
+        mock_partial.side_effect = [
+            _fake_day("Lunch 2"), _fake_day("Lunch 2"),
+            _fake_day("Bean Chili"), _fake_day("Fresh Pasta"),
+        ]
+        regen_resp = await client.post(
+            f"/api/plan/{plan_id}/regenerate",
+            headers=auth_headers,
+            json={"frozen_meals": [{"day_index": 1, "meal_index": 0}]},
+        )
+        assert regen_resp.status_code == 200
+        names = [day["meals"][0]["name"] for day in regen_resp.json()["days"]]
+        assert names == ["Bean Chili", "Lunch 2", "Fresh Pasta"]
+
+        assert mock_partial.await_count == 4
+        for call in mock_partial.await_args_list[2:]:
+            assert call.args[0].past_meals == ["Lunch 2"]
+
+    @patch("app.api.plan.generate_partial_day", new_callable=AsyncMock)
+    @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
+    async def test_independent_regenerate_keeps_duplicate_when_retry_fails(
+        self,
+        mock_gen: AsyncMock,
+        mock_partial: AsyncMock,
+        client: AsyncClient,
+        auth_headers: dict,
+    ):
+        mock_gen.side_effect = _fake_day_numbered
+        plan_resp = await client.post(
+            "/api/plan?days=2",
+            headers=auth_headers,
+            json={"meals_per_day": 1, "people_count": 2, "independent_days": True},
+        )
+        plan_id = plan_resp.json()["plan_id"]
+
+        mock_partial.side_effect = [_fake_day("Lunch 2"), RuntimeError("provider down")]
+        regen_resp = await client.post(
+            f"/api/plan/{plan_id}/regenerate",
+            headers=auth_headers,
+            json={"frozen_meals": [{"day_index": 1, "meal_index": 0}]},
+        )
+        assert regen_resp.status_code == 200
+        names = [day["meals"][0]["name"] for day in regen_resp.json()["days"]]
+        assert names == ["Lunch 2", "Lunch 2"]
+
     @patch("app.api.plan.generate_single_day", new_callable=AsyncMock)
     async def test_regenerate_confirmed_plan_rejected(
         self, mock_gen: AsyncMock, client: AsyncClient, auth_headers: dict
@@ -3,8 +3,17 @@
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.db_models import RecipeRow
 from app.models.recipes import Recipe
-from app.services.recipe_retriever import _row_to_recipe, get_embedding_model
+from app.services.recipe_retriever import (
+    _encode_query,
+    _row_to_recipe,
+    get_embedding_model,
+    retrieve_recipes,
+)
 
 
 class TestRowToRecipe:
@@ -93,3 +102,56 @@ class TestGetEmbeddingModel:
 
         # Clean up
         module._model = None
+
+
+class TestEncodeQuery:
+    @patch("app.services.recipe_retriever.get_embedding_model")
+    def test_identical_queries_embed_once(self, mock_get_model: MagicMock):
+        import numpy as np
+
+        mock_model = MagicMock()
+        mock_model.embed.side_effect = lambda texts: iter([np.array([0.5, 0.25])])
+        mock_get_model.return_value = mock_model
+        _encode_query.cache_clear()
+
+        first = _encode_query("chicken, rice")
+        second = _encode_query("chicken, rice")
+
+        assert first == second == (0.5, 0.25)
+        mock_model.embed.assert_called_once_with(["chicken, rice"])
+        _encode_query.cache_clear()
+
+
+def _axis(i: int, dims: int = 384) -> tuple[float, ...]:
+    """Unit vector along axis i, so cosine distances are easy to reason about."""
+    return tuple(1.0 if d == i else 0.0 for d in range(dims))
+
+
+class TestRetrieveRecipes:
+    @patch("app.services.recipe_retriever._encode_query")
+    async def test_returns_nearest_recipes_first(
+        self, mock_encode: MagicMock, db_session: AsyncSession
+    ):
+        # Rows are built up front and land in one executemany INSERT
+        rows = [
+            {
+                "title": title,
+                "ingredients_text": ingredients,
+                "steps_text": "Cook",
+                "embedding": list(_axis(axis)),
+            }
+            for title, ingredients, axis in [
+                ("Curry", "chicken; rice", 0),
+                ("Salad", "lettuce; tomato", 1),
+                ("Omelette", "egg; cheese", 2),
+            ]
+        ]
+        await db_session.execute(insert(RecipeRow), rows)
+        # Closest to Salad, then Curry, orthogonal to Omelette
+        mock_encode.return_value = tuple(a + 0.5 * b for a, b in zip(_axis(1), _axis(0)))
+
+        recipes = await retrieve_recipes(db_session, "lettuce, chicken", k=2)
+
+        assert [r.title for r in recipes] == ["Salad", "Curry"]
+        assert recipes[0].ingredients == ["lettuce", "tomato"]
+        mock_encode.assert_called_once_with("lettuce, chicken")
@@ -161,3 +161,89 @@ class TestExpiredToken:
             headers={"Authorization": f"Bearer {expired_token}"},
         )
         assert resp.status_code == 401
+
+
+class TestUserCache:
+    """get_current_user keeps a short-lived per-process snapshot of the User row."""
+
+    async def test_repeat_request_skips_user_select(
+        self, unauthed_client: AsyncClient, auth_headers: dict, test_user, db_session
+    ):
+        from sqlalchemy import event
+
+        resp = await unauthed_client.get("/api/users", headers=auth_headers)
+        assert resp.status_code == 200
+
+        # Forget the identity so only the cache can answer without a SELECT
+        db_session.expunge(test_user)
+        statements: list[str] = []
+        sync_conn = db_session.bind.sync_connection
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(sync_conn, "before_cursor_execute", record)
+        try:
+            resp = await unauthed_client.get("/api/users", headers=auth_headers)
+        finally:
+            event.remove(sync_conn, "before_cursor_execute", record)
+
+        assert resp.status_code == 200
+        assert resp.json()["email"] == TEST_EMAIL
+        assert not [s for s in statements if 'FROM "user"' in s]
+
+    async def test_patch_invalidates_cached_user(
+        self, unauthed_client: AsyncClient, auth_headers: dict, test_user
+    ):
+        await unauthed_client.get("/api/users", headers=auth_headers)
+
+        resp = await unauthed_client.patch(
+            "/api/users", headers=auth_headers, json={"language": "Czech"},
+        )
+        assert resp.status_code == 200
+
+        resp = await unauthed_client.get("/api/users", headers=auth_headers)
+        assert resp.json()["language"] == "Czech"
+
+    async def test_invalidation_during_load_is_not_overwritten(
+        self, unauthed_client: AsyncClient, auth_headers: dict, test_user, db_session, monkeypatch
+    ):
+        from app.api.deps import _user_cache, invalidate_cached_user
+
+        original_get = db_session.get
+
+        async def get_then_invalidate(*args, **kwargs):
+            # A profile update lands while this request still holds the old row
+            row = await original_get(*args, **kwargs)
+            invalidate_cached_user(test_user.id)
+            return row
+
+        monkeypatch.setattr(db_session, "get", get_then_invalidate)
+        resp = await unauthed_client.get("/api/users", headers=auth_headers)
+        assert resp.status_code == 200
+        assert test_user.id not in _user_cache
+
+    async def test_cache_leaves_out_password_hash(
+        self, unauthed_client: AsyncClient, auth_headers: dict, test_user
+    ):
+        from app.api.deps import _user_cache
+
+        await unauthed_client.get("/api/users", headers=auth_headers)
+        assert "hashed_password" not in _user_cache[test_user.id][1]
+
+    async def test_patch_after_user_deleted_elsewhere_is_unauthorized(
+        self, unauthed_client: AsyncClient, auth_headers: dict, test_user, db_session
+    ):
+        from sqlalchemy import delete
+        from app.models.db_models import User
+
+        await unauthed_client.get("/api/users", headers=auth_headers)
+
+        # Another worker deletes the row; this worker's snapshot still says it exists
+        db_session.expunge(test_user)
+        await db_session.execute(delete(User).where(User.id == test_user.id))
+
+        resp = await unauthed_client.patch(
+            "/api/users", headers=auth_headers, json={"country": "Czechia"},
+        )
+        assert resp.status_code == 401